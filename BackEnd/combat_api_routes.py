@@ -4,19 +4,281 @@ Combat API Routes
 Flask endpoints for JRPG combat system
 """
 
-from flask import url_for, jsonify, request, session
-from typing import Dict, Optional
+from flask import Response, url_for, jsonify, request, session, g, has_request_context, after_this_request
+from typing import Dict, Mapping, Optional
+from types import MappingProxyType
+from collections import OrderedDict
+from operator import attrgetter
+import threading
+import logging
 import json
+import os
 import random
+import re
+import sys
 
-from component.GameState.combat_state import CombatState, CombatParticipant
+from component.GameState.combat_state import CombatState, CombatParticipant, CombatPhase, ParticipantType
 from component.GameState.combat_ai import CombatAI, CombatActionResolver
 from component.campaign_manager import CampaignManager
 from phase_3 import load_story_package_data, save_story_package_data
 
 
-import pickle
-import base64
+import msgpack
+
+log = logging.getLogger(__name__)
+
+# msgspec speaks the same msgpack wire format but encodes/decodes much faster
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+if MSGSPEC_AVAILABLE:
+    _ENCODER = msgspec.msgpack.Encoder()
+    _DECODER = msgspec.msgpack.Decoder()
+
+# zstd shrinks the stored msgpack ~3x (repeated field names, enum strings)
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+if ZSTD_AVAILABLE:
+    _ZC = zstd.ZstdCompressor(level=1)
+    _ZD = zstd.ZstdDecompressor()
+
+# Frame header written by zstd; msgpack maps never start with these bytes
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# ============================================================================
+# COMBAT STORE
+# ============================================================================
+# Combat state is kept server-side; the cookie session only carries
+# current_combat_id. Redis is used when REDIS_URL is set, otherwise an
+# in-process store (fine for the single-process dev server). Both keep
+# serialized bytes, so every request works on its own decoded copy.
+
+COMBAT_TTL_SECONDS = 3600
+
+
+class MemoryCombatStore:
+    """In-process combat store holding serialized combats, bounded to the most recently used"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load_bytes(self, combat_id: str) -> Optional[bytes]:
+        with self._lock:
+            combat_bytes = self._data.get(combat_id)
+            if combat_bytes is not None:
+                self._data.move_to_end(combat_id)
+            return combat_bytes
+
+    def load(self, combat_id: str) -> Optional[CombatState]:
+        combat_bytes = self.load_bytes(combat_id)
+        return deserialize_combat(combat_bytes) if combat_bytes is not None else None
+
+    def save(self, combat_id: str, combat: CombatState):
+        combat_bytes = serialize_combat(combat)
+        with self._lock:
+            self._data[combat_id] = combat_bytes
+            self._data.move_to_end(combat_id)
+            if len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, combat_id: str):
+        with self._lock:
+            self._data.pop(combat_id, None)
+
+
+class RedisCombatStore:
+    """Redis combat store; each combat is one key holding serialized bytes"""
+
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url)
+
+    def load_bytes(self, combat_id: str) -> Optional[bytes]:
+        combat_bytes = self.client.get(f'combat:{combat_id}')
+        if combat_bytes is not None:
+            remember_combat(combat_id, combat_bytes)
+        return combat_bytes
+
+    def load(self, combat_id: str) -> Optional[CombatState]:
+        # Decoded per request, so concurrent requests never share a combat
+        combat_bytes = self.load_bytes(combat_id)
+        return deserialize_combat(combat_bytes) if combat_bytes is not None else None
+
+    def save(self, combat_id: str, combat: CombatState):
+        combat_bytes = serialize_combat(combat)
+        key = f'combat:{combat_id}'
+        if cached_combat_bytes(combat_id) == combat_bytes:
+            # Same bytes as loaded/last saved: only refresh the TTL
+            self.client.expire(key, COMBAT_TTL_SECONDS)
+        else:
+            self.client.set(key, combat_bytes, ex=COMBAT_TTL_SECONDS)
+        remember_combat(combat_id, combat_bytes)
+
+    def delete(self, combat_id: str):
+        self.client.delete(f'combat:{combat_id}')
+        forget_combat(combat_id)
+
+
+_redis_url = os.environ.get('REDIS_URL')
+if REDIS_AVAILABLE and _redis_url:
+    combat_store = RedisCombatStore(_redis_url)
+else:
+    combat_store = MemoryCombatStore()
+
+# Per-process record of the bytes each combat was last read from or written
+# to Redis as, keyed by combat id. RedisCombatStore.save compares against it
+# to skip re-uploading unchanged bytes.
+_COMBAT_CACHE_SIZE = 256
+_combat_cache: 'OrderedDict[str, bytes]' = OrderedDict()
+_combat_cache_lock = threading.Lock()
+
+
+def remember_combat(combat_id: str, combat_bytes: bytes):
+    """Record the bytes a combat was just loaded from or saved as"""
+    with _combat_cache_lock:
+        _combat_cache[combat_id] = combat_bytes
+        _combat_cache.move_to_end(combat_id)
+        if len(_combat_cache) > _COMBAT_CACHE_SIZE:
+            _combat_cache.popitem(last=False)
+
+
+def cached_combat_bytes(combat_id: str) -> Optional[bytes]:
+    """Bytes the combat was last loaded from or saved as, if any"""
+    with _combat_cache_lock:
+        return _combat_cache.get(combat_id)
+
+
+def forget_combat(combat_id: str):
+    """Drop the recorded bytes for a combat (e.g. once it is deleted)"""
+    with _combat_cache_lock:
+        _combat_cache.pop(combat_id, None)
+
+
+# Encoded /summary response bodies, keyed by combat id and stored with the
+# combat bytes they were built from. Stored bytes never change in place, so
+# a body is reused only while the combat is unchanged; no decoded (mutable)
+# combat is kept.
+_summary_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def cached_summary_body(combat_id: str, combat_bytes: bytes) -> Optional[bytes]:
+    """The summary body built from exactly these combat bytes, if cached"""
+    with _summary_cache_lock:
+        entry = _summary_cache.get(combat_id)
+        if entry is None or (entry[0] is not combat_bytes and entry[0] != combat_bytes):
+            return None
+        _summary_cache.move_to_end(combat_id)
+        return entry[1]
+
+
+def remember_summary_body(combat_id: str, combat_bytes: bytes, body: bytes):
+    """Cache a summary body under the combat bytes it was built from"""
+    with _summary_cache_lock:
+        _summary_cache[combat_id] = (combat_bytes, body)
+        _summary_cache.move_to_end(combat_id)
+        if len(_summary_cache) > _COMBAT_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+
+def get_combat_from_session(combat_id: str):
+    """Load the combat for this id from the combat store"""
+    # A combat saved earlier in this request is returned as-is (not yet written)
+    if has_request_context():
+        pending = g.get('_combat_dirty')
+        if pending and combat_id in pending:
+            return pending[combat_id]
+    
+    try:
+        return combat_store.load(combat_id)
+    except Exception as e:
+        log.exception("[Combat API] Error deserializing combat")
+        return None
+
+
+def save_combat_to_session(combat_id: str, combat):
+    """Mark combat for saving; it is written once when the request ends"""
+    if not has_request_context():
+        write_combat_now(combat_id, combat)
+        return
+    
+    pending = g.get('_combat_dirty')
+    if pending is None:
+        pending = g._combat_dirty = {}
+        after_this_request(_flush_pending_combats)
+    pending[combat_id] = combat
+
+
+def delete_combat_from_session(combat_id: str):
+    """Remove a finished or abandoned combat from the store"""
+    if has_request_context():
+        pending = g.get('_combat_dirty')
+        if pending:
+            pending.pop(combat_id, None)
+    combat_store.delete(combat_id)
+
+
+def write_combat_now(combat_id: str, combat):
+    """Write combat into the combat store immediately (no end-of-request flush)
+    
+    For routes that render a page rather than JSON, where a failed deferred
+    save could not be reported in the response.
+    """
+    try:
+        combat_store.save(combat_id, combat)
+    except Exception as e:
+        log.exception("[Combat API] Error serializing combat")
+        raise
+
+
+def _flush_pending_combats(response):
+    """Write every combat saved during this request, unless the request failed"""
+    pending = g.pop('_combat_dirty', None) or {}
+    if response.status_code >= 400:
+        # The working copies may be half-updated; the stored combat stays as it was
+        return response
+    for combat_id, combat in pending.items():
+        try:
+            write_combat_now(combat_id, combat)
+        except Exception as e:
+            response = jsonify({
+                'success': False,
+                'error': f'Failed to save combat: {str(e)}'
+            })
+            response.status_code = 500
+    return response
+
+
+# Sentinel for getattr probes: a miss costs no AttributeError, unlike hasattr
+_MISSING = object()
+
+_SPELLCASTER_CLASSES = frozenset(['Cleric', 'Druid', 'Bard'])
+
+# Basic spell slot table by character level (simplified); add more levels as needed
+_SPELL_SLOTS_BY_LEVEL: Mapping[int, Mapping[int, int]] = MappingProxyType({
+    1: MappingProxyType({1: 2}),
+    2: MappingProxyType({1: 3}),
+    3: MappingProxyType({1: 4, 2: 2}),
+    4: MappingProxyType({1: 4, 2: 3}),
+    5: MappingProxyType({1: 4, 2: 3, 3: 2})
+})
+_DEFAULT_SPELL_SLOTS: Mapping[int, int] = MappingProxyType({1: 2})
+
 
 def initialize_character_resources(character):
     """Initialize resource tracking attributes for a character"""
@@ -25,75 +287,562 @@ def initialize_character_resources(character):
     char_class = getattr(character, 'char_class', None)
     
     # Initialize spell slots based on class and level
-    if char_class in ['Cleric', 'Druid', 'Bard']:
-        if not hasattr(character, 'spell_slots_used'):
+    if char_class in _SPELLCASTER_CLASSES:
+        if getattr(character, 'spell_slots_used', _MISSING) is _MISSING:
             character.spell_slots_used = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 0}
         
-        if not hasattr(character, 'spell_slots'):
-            # Basic spell slot table (simplified)
-            spell_slots_by_level = {
-                1: {1: 2},
-                2: {1: 3},
-                3: {1: 4, 2: 2},
-                4: {1: 4, 2: 3},
-                5: {1: 4, 2: 3, 3: 2}
-                # Add more levels as needed
-            }
-            character.spell_slots = spell_slots_by_level.get(level, {1: 2})
+        if getattr(character, 'spell_slots', _MISSING) is _MISSING:
+            # Copy: the character's table must stay mutable and unshared
+            character.spell_slots = dict(_SPELL_SLOTS_BY_LEVEL.get(level, _DEFAULT_SPELL_SLOTS))
     
     # Initialize class-specific resources
     if char_class == 'Barbarian':
-        if not hasattr(character, 'rages_used'):
+        if getattr(character, 'rages_used', _MISSING) is _MISSING:
             character.rages_used = 0
-        if not hasattr(character, 'currently_raging'):
+        if getattr(character, 'currently_raging', _MISSING) is _MISSING:
             character.currently_raging = False
     
     elif char_class == 'Bard':
-        if not hasattr(character, 'bardic_inspiration_remaining'):
-            cha_mod = (character.stats.get('charisma', 10) - 10) // 2 if hasattr(character, 'stats') else 2
+        if getattr(character, 'bardic_inspiration_remaining', _MISSING) is _MISSING:
+            stats = getattr(character, 'stats', _MISSING)
+            cha_mod = (stats.get('charisma', 10) - 10) // 2 if stats is not _MISSING else 2
             character.bardic_inspiration_remaining = max(1, cha_mod)
-        if not hasattr(character, 'bardic_inspiration_die'):
+        if getattr(character, 'bardic_inspiration_die', _MISSING) is _MISSING:
             character.bardic_inspiration_die = 'd6'
     
     elif char_class == 'Cleric':
-        if not hasattr(character, 'channel_divinity_used'):
+        if getattr(character, 'channel_divinity_used', _MISSING) is _MISSING:
             character.channel_divinity_used = 0
     
     elif char_class == 'Druid':
-        if not hasattr(character, 'wild_shape_uses_remaining'):
+        if getattr(character, 'wild_shape_uses_remaining', _MISSING) is _MISSING:
             character.wild_shape_uses_remaining = 2
-        if not hasattr(character, 'currently_wild_shaped'):
+        if getattr(character, 'currently_wild_shaped', _MISSING) is _MISSING:
             character.currently_wild_shaped = False
             
-def serialize_combat(combat) -> str:
-    """Serialize combat state to string for session storage"""
+def serialize_combat(combat) -> bytes:
+    """Serialize combat state to msgpack bytes (zstd-compressed if available)"""
     try:
-        pickled = pickle.dumps(combat)
-        return base64.b64encode(pickled).decode('utf-8')
+        if MSGSPEC_AVAILABLE:
+            packed = _ENCODER.encode(combat.to_dict())
+        else:
+            packed = msgpack.packb(combat.to_dict(), use_bin_type=True)
+        if ZSTD_AVAILABLE:
+            return _ZC.compress(packed)
+        return packed
     except Exception as e:
-        print(f"Error serializing combat: {e}")
+        log.error("Error serializing combat: %s", e)
         raise
 
-def deserialize_combat(combat_str: str):
-    """Deserialize combat state from session string"""
+def deserialize_combat(combat_bytes: bytes):
+    """Deserialize combat state from msgpack session bytes"""
     try:
-        pickled = base64.b64decode(combat_str.encode('utf-8'))
-        return pickle.loads(pickled)
+        if combat_bytes[:4] == _ZSTD_MAGIC:
+            combat_bytes = _ZD.decompress(combat_bytes)
+        if MSGSPEC_AVAILABLE:
+            data = _DECODER.decode(combat_bytes)
+        else:
+            # Spell slot tables are keyed by int level, so allow non-str map keys
+            data = msgpack.unpackb(combat_bytes, raw=False, strict_map_key=False)
+        return CombatState.from_dict(data)
     except Exception as e:
-        print(f"Error deserializing combat: {e}")
+        log.error("Error deserializing combat: %s", e)
         raise
 
 
+# ============================================================================
+# ACTION RESOLUTION
+# ============================================================================
+
+# Dice are rolled with getrandbits plus rejection sampling: the same draws
+# random.randint makes (so random.seed() reproduces them), minus its call layers
+_getrandbits = random.getrandbits
+
+
+def _d20() -> int:
+    """Roll 1d20"""
+    roll = _getrandbits(5)
+    while roll >= 20:
+        roll = _getrandbits(5)
+    return roll + 1
+
+
+def _d100() -> int:
+    """Roll 1d100"""
+    roll = _getrandbits(7)
+    while roll >= 100:
+        roll = _getrandbits(7)
+    return roll + 1
+
+
+def resolve_attack(attacker, target) -> dict:
+    """Resolve a basic attack action"""
+    attacker_name = attacker.name
+    target_name = target.name
+    target_entity = target.entity
+    target_id = target.participant_id
+
+    log.debug("[Combat] Resolving attack: %s -> %s", attacker_name, target_name)
+
+    # Calculate attack roll (1d20 + modifiers)
+    attack_roll = _d20()
+    attack_bonus = get_attack_bonus(attacker)
+    total_attack = attack_roll + attack_bonus
+
+    # Get target's AC
+    target_ac = target_entity.ac
+    target_max_hp = target.get_max_hp()
+
+    # Check for critical hit/miss
+    is_critical = attack_roll == 20
+    is_miss = attack_roll == 1 or (total_attack < target_ac and not is_critical)
+
+    log.debug("[Combat] Attack roll: %d + %d = %d vs AC %d", attack_roll, attack_bonus, total_attack, target_ac)
+
+    # Fields shared by the hit and miss results
+    result = {
+        'success': True,
+        'type': 'attack',
+        'attacker': attacker_name,
+        'target': target_id,  # Use participant_id instead of name
+        'max_hp': target_max_hp,
+        'attack_roll': attack_roll,
+        'attack_bonus': attack_bonus,
+        'total_attack': total_attack,
+        'target_ac': target_ac
+    }
+
+    if is_miss:
+        result.update(
+            hit=False,
+            message=f"{attacker_name} attacks {target_name} but misses! (Rolled {attack_roll}+{attack_bonus}={total_attack} vs AC {target_ac})",
+            damage=0,
+            new_hp=target_entity.hp,
+            target_defeated=False
+        )
+        return result
+
+    # Calculate damage
+    damage = calculate_damage(attacker, is_critical)
+
+    # Apply damage
+    new_hp = max(0, target_entity.hp - damage)
+    target_entity.hp = new_hp
+
+    target_defeated = new_hp <= 0
+    crit_text = " CRITICAL HIT!" if is_critical else ""
+
+    log.debug("[Combat] Damage dealt: %d, new HP: %d/%d", damage, new_hp, target_max_hp)
+
+    result.update(
+        hit=True,
+        critical=is_critical,
+        message=f"{attacker_name} attacks {target_name} for {damage} damage!{crit_text}",
+        damage=damage,
+        new_hp=new_hp,
+        target_defeated=target_defeated
+    )
+    return result
+
+
+def resolve_defend(character) -> dict:
+    """Resolve a defend action"""
+    return {
+        'success': True,
+        'message': f"{character.name} takes a defensive stance! (+2 AC until next turn)",
+        'type': 'defend',
+        'character': character.name,
+        'effect': 'defending'
+    }
+
+
+def resolve_skill(character, skill_name, target, skill_data) -> dict:
+    """Resolve a character skill/ability"""
+    entity = character.entity
+    char_class = getattr(entity, 'char_class', None)
+
+    # Spells resolve the same way for every caster class
+    if char_class in _SPELLCASTER_CLASSES and skill_name.startswith('Spell:'):
+        return resolve_spell(entity, character, skill_name, target, skill_data)
+
+    # Route to class-specific handlers
+    handler = _SKILL_HANDLERS.get(char_class)
+    if handler is None:
+        return {
+            'success': False,
+            'error': f'Unknown character class: {char_class}'
+        }
+    return handler(character, skill_name, target, skill_data)
+
+
+def _skill_result(character, result_type: str, effect: str, message: str,
+                  resource_changes: Optional[dict] = None, target: Optional[str] = None) -> dict:
+    """Build the success result shared by the class skill resolvers"""
+    result = {
+        'success': True,
+        'message': message,
+        'type': result_type,
+        'character': character.name,
+        'effect': effect
+    }
+    if target is not None:
+        result['target'] = target
+    if resource_changes is not None:
+        result['resource_changes'] = resource_changes
+    return result
+
+
+def resolve_barbarian_skill(character, skill_name, target, skill_data):
+    """Resolve Barbarian abilities"""
+    barbarian = character.entity
+
+    if skill_name == 'Rage':
+        if barbarian.enter_rage():
+            return _skill_result(
+                character, 'buff', 'rage',
+                f"{character.name} enters a RAGE! 🔥 (+{barbarian.rage_damage} damage, resistance)",
+                resource_changes={
+                    'rages_remaining': barbarian.rages_per_day - barbarian.rages_used,
+                    'currently_raging': True
+                }
+            )
+        else:
+            return {'success': False, 'error': 'No rage uses remaining!'}
+
+    elif skill_name == 'Reckless Attack':
+        return _skill_result(
+            character, 'buff', 'reckless',
+            f"{character.name} attacks recklessly! (Advantage on attacks, enemies have advantage)"
+        )
+
+    return {'success': False, 'error': f'Unknown Barbarian skill: {skill_name}'}
+
+
+def resolve_bard_skill(character, skill_name, target, skill_data):
+    """Resolve Bard abilities"""
+    bard = character.entity
+
+    if skill_name == 'Bardic Inspiration':
+        if bard.use_bardic_inspiration():
+            return _skill_result(
+                character, 'buff', 'inspiration',
+                f"{character.name} grants Bardic Inspiration to {target.name}! ({bard.bardic_inspiration_die})",
+                resource_changes={
+                    'bardic_inspiration_remaining': bard.bardic_inspiration_remaining
+                },
+                target=target.participant_id
+            )
+        else:
+            return {'success': False, 'error': 'No Bardic Inspiration uses remaining!'}
+
+    return {'success': False, 'error': f'Unknown Bard skill: {skill_name}'}
+
+
+def resolve_cleric_skill(character, skill_name, target, skill_data):
+    """Resolve Cleric abilities"""
+    cleric = character.entity
+
+    if skill_name == 'Channel Divinity: Turn Undead':
+        max_uses = 1 if cleric.level < 6 else (2 if cleric.level < 18 else 3)
+        if cleric.channel_divinity_used < max_uses:
+            cleric.channel_divinity_used += 1
+            return _skill_result(
+                character, 'effect', 'turn_undead',
+                f"{character.name} channels divinity to turn undead!",
+                resource_changes={
+                    'channel_divinity_remaining': max_uses - cleric.channel_divinity_used
+                }
+            )
+        else:
+            return {'success': False, 'error': 'No Channel Divinity uses remaining!'}
+
+    return {'success': False, 'error': f'Unknown Cleric skill: {skill_name}'}
+
+
+def resolve_druid_skill(character, skill_name, target, skill_data):
+    """Resolve Druid abilities"""
+    druid = character.entity
+
+    if skill_name == 'Wild Shape':
+        beast_name = skill_data.get('beast_name', 'Wolf')
+        beast_hp = skill_data.get('beast_hp', 15)
+
+        if druid.enter_wild_shape(beast_name, beast_hp):
+            return _skill_result(
+                character, 'transform', 'wild_shape',
+                f"{character.name} transforms into a {beast_name}!",
+                resource_changes={
+                    'wild_shape_remaining': druid.wild_shape_uses_remaining,
+                    'beast_name': beast_name,
+                    'beast_hp': beast_hp
+                }
+            )
+        else:
+            return {'success': False, 'error': 'No Wild Shape uses remaining!'}
+
+    return {'success': False, 'error': f'Unknown Druid skill: {skill_name}'}
+
+
+_SKILL_HANDLERS = {
+    'Barbarian': resolve_barbarian_skill,
+    'Bard': resolve_bard_skill,
+    'Cleric': resolve_cleric_skill,
+    'Druid': resolve_druid_skill,
+}
+
+
+# Spells whose name contains any of these words heal instead of damaging
+_HEALING_RE = re.compile(r'heal|cure|restore', re.IGNORECASE)
+
+
+def resolve_spell(caster_entity, character, skill_name, target, skill_data):
+    """Resolve spell casting"""
+    spell_name = skill_name.replace('Spell:', '').strip()
+    spell_level = skill_data.get('level', 1)
+
+    # Check spell slots
+    slots_used = caster_entity.spell_slots_used
+    used = slots_used.get(spell_level, 0)
+    max_slots = caster_entity.spell_slots.get(spell_level, 0)
+
+    if used >= max_slots:
+        return {'success': False, 'error': f'No level {spell_level} spell slots remaining!'}
+
+    # Use spell slot
+    slots_used[spell_level] = used + 1
+    resource_changes = {'spell_slots_used': slots_used}
+
+    target_entity = target.entity
+
+    # Determine spell type
+    is_healing = _HEALING_RE.search(spell_name) is not None
+
+    if is_healing:
+        # Healing spell
+        healing = random.randint(1, 8) * spell_level + get_spell_modifier(caster_entity)
+
+        # Cleric life domain bonus
+        if hasattr(caster_entity, 'disciple_of_life') and caster_entity.disciple_of_life:
+            healing += 2 + spell_level
+
+        max_hp = target.get_max_hp()
+        new_hp = min(target_entity.hp + healing, max_hp)
+        target_entity.hp = new_hp
+
+        return {
+            'success': True,
+            'message': f"{character.name} casts {spell_name} on {target.name}, healing {healing} HP!",
+            'type': 'healing',
+            'character': character.name,
+            'target': target.participant_id,
+            'healing': healing,
+            'new_hp': new_hp,
+            'max_hp': max_hp,
+            'resource_changes': resource_changes
+        }
+    else:
+        # Damage spell
+        damage = random.randint(2, 8) * spell_level
+        new_hp = max(0, target_entity.hp - damage)
+        target_entity.hp = new_hp
+
+        return {
+            'success': True,
+            'message': f"{character.name} casts {spell_name} on {target.name} for {damage} damage!",
+            'type': 'damage',
+            'character': character.name,
+            'target': target.participant_id,
+            'damage': damage,
+            'new_hp': new_hp,
+            'max_hp': target.get_max_hp(),
+            'target_defeated': new_hp <= 0,
+            'resource_changes': resource_changes
+        }
+
+
+def get_attack_bonus(participant) -> int:
+    """Calculate attack bonus"""
+    entity = participant.entity
+
+    stats = getattr(entity, 'stats', None)
+    if isinstance(stats, dict):
+        str_score = stats.get('strength', 10)
+        str_mod = (str_score - 10) // 2
+        prof_bonus = get_proficiency_bonus(getattr(entity, 'level', 1))
+        return str_mod + prof_bonus
+    return 2  # Default
+
+
+def get_proficiency_bonus(level: int) -> int:
+    """Get proficiency bonus by level (+2 at 1st, +1 every 4 levels, max +6)"""
+    return min(6, 2 + max(0, (level - 1) // 4))
+
+
 def get_spell_modifier(entity) -> int:
     """Get spellcasting modifier"""
-    if hasattr(entity, 'stats') and isinstance(entity.stats, dict):
+    stats = getattr(entity, 'stats', None)
+    if isinstance(stats, dict):
         # Use wisdom for clerics/druids, charisma for bards
-        stat = 'wisdom' if getattr(entity, 'char_class') in ['Cleric', 'Druid'] else 'charisma'
-        score = entity.stats.get(stat, 10)
+        stat = 'wisdom' if getattr(entity, 'char_class') in ('Cleric', 'Druid') else 'charisma'
+        score = stats.get(stat, 10)
         return (score - 10) // 2
     return 0
 
 
+def calculate_damage(attacker, is_critical: bool = False) -> int:
+    """Calculate attack damage"""
+    entity = attacker.entity
+
+    # Base damage (1d8 weapon, 2d8 on a critical)
+    damage = random.randint(1, 8)
+    if is_critical:
+        damage += random.randint(1, 8)
+
+    # Add STR modifier
+    stats = getattr(entity, 'stats', None)
+    if isinstance(stats, dict):
+        str_score = stats.get('strength', 10)
+        str_mod = (str_score - 10) // 2
+        damage += str_mod
+
+    # Add rage damage if raging
+    if getattr(entity, 'currently_raging', False):
+        damage += entity.rage_damage
+
+    return max(1, damage)
+
+
+# Skills that can be used without picking a target
+_UNTARGETED_SKILLS = frozenset(['Rage', 'Wild Shape', 'Reckless Attack'])
+
+
+def _handle_attack(combat, character, action_name, target, action_data) -> dict:
+    if not target:
+        return {'success': False, 'error': 'No target specified for attack'}
+    return resolve_attack(character, target)
+
+
+def _handle_defend(combat, character, action_name, target, action_data) -> dict:
+    return resolve_defend(character)
+
+
+def _handle_skill(combat, character, action_name, target, action_data) -> dict:
+    if not target and action_name not in _UNTARGETED_SKILLS:
+        return {'success': False, 'error': 'No target specified for skill'}
+    return resolve_skill(character, action_name, target, action_data)
+
+
+def _handle_item(combat, character, action_name, target, action_data) -> dict:
+    return {'success': False, 'error': 'Item usage not yet implemented'}
+
+
+_ACTION_HANDLERS = {
+    'attack': _handle_attack,
+    'defend': _handle_defend,
+    'skill': _handle_skill,
+    'item': _handle_item,
+}
+
+
+def resolve_action(combat, character, action_type, action_name, target, action_data) -> dict:
+    """Resolve a player action by its action_type ('attack', 'skill', 'defend', 'item')"""
+    handler = _ACTION_HANDLERS.get(action_type)
+    if handler is None:
+        return {'success': False, 'error': f'Unknown action type: {action_type}'}
+    return handler(combat, character, action_name, target, action_data)
+
+
+# Fetches every participant field the summary needs in one C-level call
+_participant_fields = attrgetter('participant_id', 'name', 'participant_type',
+                                 'initiative_total', 'entity', 'conditions')
+
+
+def _build_pdata(p) -> dict:
+    """Build the summary fields shared by every participant"""
+    pid, name, ptype, initiative, entity, conditions = _participant_fields(p)
+    hp = entity.hp
+    participant_data = {
+        'participant_id': pid,
+        'id': pid,
+        'name': name,
+        'type': ptype.value,
+        'initiative': initiative,
+        'hp': hp,
+        'max_hp': getattr(entity, 'max_hp', hp),
+        'ac': entity.ac,
+        'is_alive': hp > 0,
+        'conditions': list(conditions)
+    }
+
+    return participant_data
+
+
+def _build_character_pdata(p) -> dict:
+    """Build a summary entry for a character participant, including class resources"""
+    participant_data = _build_pdata(p)
+    entity = p.entity
+    participant_data['class'] = getattr(entity, 'char_class', 'Unknown')
+    participant_data['level'] = getattr(entity, 'level', 1)
+
+    # Add resources based on class
+    raging = getattr(entity, 'currently_raging', _MISSING)
+    if raging is not _MISSING:
+        participant_data['rage'] = {
+            'active': raging,
+            'uses_remaining': entity.rages_per_day - entity.rages_used
+        }
+
+    inspiration = getattr(entity, 'bardic_inspiration_remaining', _MISSING)
+    if inspiration is not _MISSING:
+        participant_data['bardic_inspiration'] = {
+            'remaining': inspiration,
+            'die': entity.bardic_inspiration_die
+        }
+
+    slots_used = getattr(entity, 'spell_slots_used', _MISSING)
+    if slots_used is not _MISSING:
+        participant_data['spell_slots'] = {
+            'used': slots_used,
+            'max': entity.spell_slots
+        }
+
+    wild_shapes = getattr(entity, 'wild_shape_uses_remaining', _MISSING)
+    if wild_shapes is not _MISSING:
+        shaped = entity.currently_wild_shaped
+        participant_data['wild_shape'] = {
+            'remaining': wild_shapes,
+            'active': shaped,
+            'beast': entity.wild_shape_beast if shaped else None
+        }
+
+    divinity_used = getattr(entity, 'channel_divinity_used', _MISSING)
+    if divinity_used is not _MISSING:
+        max_uses = 1 if entity.level < 6 else (2 if entity.level < 18 else 3)
+        participant_data['channel_divinity'] = {
+            'remaining': max_uses - divinity_used
+        }
+
+    return participant_data
+
+
+# Pre-encoded bodies for the stock error responses (a fresh Response is built per request)
+def _json_error_body(message: str) -> bytes:
+    return json.dumps({'success': False, 'error': message}, separators=(',', ':')).encode('utf-8')
+
+
+_ERR_COMBAT_NOT_FOUND = _json_error_body('Combat not found')
+_ERR_NOT_IN_SESSION = _json_error_body('Combat not found in session')
+_ERR_NOT_PLAYER_TURN = _json_error_body('Not a player turn')
+_ERR_NOT_ENEMY_TURN = _json_error_body('Not an enemy turn')
+_ERR_WRONG_CHARACTER = _json_error_body('Action character does not match current turn')
+_ERR_NO_TARGETS = _json_error_body('No valid targets available')
+
+
+def _stock_error(body: bytes, status: int) -> Response:
+    """Wrap a pre-encoded error body in a new JSON response"""
+    return Response(body, status=status, mimetype='application/json')
+
+
 def register_combat_routes(app):
     """Register all combat-related API routes"""
     
@@ -102,22 +851,19 @@ def register_combat_routes(app):
         """Get current combat state"""
 
         try:
-            # Get combat from session with deserialization
-            session_key = f'combat_{combat_id}'
+            combat_bytes = combat_store.load_bytes(combat_id)
+            if combat_bytes is None:
+                return _stock_error(_ERR_NOT_IN_SESSION, 404)
             
-            if session_key not in session:
-                return jsonify({
-                    'success': False,
-                    'error': 'Combat not found in session'
-                }), 404
+            # Polling an unchanged combat reuses the body built from the same bytes
+            body = cached_summary_body(combat_id, combat_bytes)
+            if body is not None:
+                return Response(body, mimetype='application/json')
             
-            # Deserialize combat state
             try:
-                combat = deserialize_combat(session[session_key])
+                combat = deserialize_combat(combat_bytes)
             except Exception as e:
-                print(f"[API] Error deserializing combat: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("[API] Error deserializing combat")
                 return jsonify({
                     'success': False,
                     'error': f'Combat deserialization failed: {str(e)}'
@@ -125,60 +871,9 @@ def register_combat_routes(app):
             
             
             # Build participant data
-            participants = []
-            for p in combat.participants:
-                participant_data = {
-                    'participant_id': p.participant_id,
-                    'id': p.participant_id,
-                    'name': p.name,
-                    'type': p.participant_type.value,
-                    'initiative': p.initiative_total,
-                    'hp': p.get_current_hp(),
-                    'max_hp': p.get_max_hp(),
-                    'ac': p.get_ac(),
-                    'is_alive': p.is_alive(),
-                    'conditions': list(p.conditions) if hasattr(p, 'conditions') else []
-                }
-                
-                # Add character-specific data
-                if p.participant_type.value == 'character':
-                    entity = p.entity
-                    participant_data['class'] = getattr(entity, 'char_class', 'Unknown')
-                    participant_data['level'] = getattr(entity, 'level', 1)
-                    
-                    # Add resources based on class
-                    if hasattr(entity, 'currently_raging'):
-                        participant_data['rage'] = {
-                            'active': entity.currently_raging,
-                            'uses_remaining': entity.rages_per_day - entity.rages_used
-                        }
-                    
-                    if hasattr(entity, 'bardic_inspiration_remaining'):
-                        participant_data['bardic_inspiration'] = {
-                            'remaining': entity.bardic_inspiration_remaining,
-                            'die': entity.bardic_inspiration_die
-                        }
-                    
-                    if hasattr(entity, 'spell_slots_used'):
-                        participant_data['spell_slots'] = {
-                            'used': entity.spell_slots_used,
-                            'max': entity.spell_slots
-                        }
-                    
-                    if hasattr(entity, 'wild_shape_uses_remaining'):
-                        participant_data['wild_shape'] = {
-                            'remaining': entity.wild_shape_uses_remaining,
-                            'active': entity.currently_wild_shaped,
-                            'beast': entity.wild_shape_beast if entity.currently_wild_shaped else None
-                        }
-                    
-                    if hasattr(entity, 'channel_divinity_used'):
-                        max_uses = 1 if entity.level < 6 else (2 if entity.level < 18 else 3)
-                        participant_data['channel_divinity'] = {
-                            'remaining': max_uses - entity.channel_divinity_used
-                        }
-                
-                participants.append(participant_data)
+            # (participants are stored characters first, then monsters)
+            participants = [_build_character_pdata(p) for p in combat.character_participants]
+            participants += [_build_pdata(p) for p in combat.monster_participants]
             
             # Get current turn info
             current_participant = combat.get_current_participant()
@@ -198,18 +893,18 @@ def register_combat_routes(app):
                 'current_turn_index': combat.current_turn_index,
                 'round': combat.current_round,
                 'phase': combat.combat_phase.value,
-                'combat_log': combat.combat_log[-20:] if hasattr(combat, 'combat_log') else []
+                'combat_log': list(combat.log)
             }
             
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'summary': summary
             })
+            remember_summary_body(combat_id, combat_bytes, response.get_data())
+            return response
             
         except Exception as e:
-            print(f"[API] Error getting combat summary: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[API] Error getting combat summary")
             return jsonify({
                 'success': False,
                 'error': str(e)
@@ -219,38 +914,33 @@ def register_combat_routes(app):
     def process_player_action(combat_id):
         """Process player's combat action"""
         try:
-            data = request.json
+            data = request.get_json(silent=True) or {}
             
             # Get combat from session
             combat = get_combat_from_session(combat_id)
             
             if not combat:
-                return jsonify({
-                    'success': False,
-                    'error': 'Combat not found'
-                }), 404
+                return _stock_error(_ERR_COMBAT_NOT_FOUND, 404)
             
             # Validate it's player's turn
             current_turn = combat.get_current_participant()
-            if not current_turn or current_turn.participant_type.value != 'character':
-                return jsonify({
-                    'success': False,
-                    'error': 'Not a player turn'
-                }), 400
+            if not current_turn or current_turn.participant_type is not ParticipantType.CHARACTER:
+                return _stock_error(_ERR_NOT_PLAYER_TURN, 400)
             
-            # Get action parameters
+            # Get action parameters (ids interned so participant lookups hit on identity)
             character_id = data.get('character_id')
             action_type = data.get('action_type')  # 'attack', 'skill', 'defend', 'item'
             action_name = data.get('action_name')
             target_id = data.get('target_id')
+            if isinstance(character_id, str):
+                character_id = sys.intern(character_id)
+            if isinstance(target_id, str):
+                target_id = sys.intern(target_id)
             action_data = data.get('action_data', {})
             
             # Validate character matches current turn
             if character_id != current_turn.participant_id:
-                return jsonify({
-                    'success': False,
-                    'error': 'Action character does not match current turn'
-                }), 400
+                return _stock_error(_ERR_WRONG_CHARACTER, 400)
             
             # Get character and target
             character = combat.get_participant_by_id(character_id)
@@ -263,41 +953,7 @@ def register_combat_routes(app):
                 }), 400
             
             # Resolve action based on type
-            result = None
-            
-            if action_type == 'attack':
-                if not target:
-                    return jsonify({
-                        'success': False,
-                        'error': 'No target specified for attack'
-                    }), 400
-                
-                result = resolve_attack(character, target)
-            
-            elif action_type == 'defend':
-                result = resolve_defend(character)
-            
-            elif action_type == 'skill':
-                # Some skills don't need targets (Rage, Wild Shape)
-                if not target and action_name not in ['Rage', 'Wild Shape', 'Reckless Attack']:
-                    return jsonify({
-                        'success': False,
-                        'error': 'No target specified for skill'
-                    }), 400
-                
-                result = resolve_skill(character, action_name, target, action_data)
-            
-            elif action_type == 'item':
-                return jsonify({
-                    'success': False,
-                    'error': 'Item usage not yet implemented'
-                }), 400
-            
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': f'Unknown action type: {action_type}'
-                }), 400
+            result = resolve_action(combat, character, action_type, action_name, target, action_data)
             
             # Check if action failed
             if not result.get('success'):
@@ -312,9 +968,7 @@ def register_combat_routes(app):
             return jsonify(result)
             
         except Exception as e:
-            print(f"[API] Error processing player action: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[API] Error processing player action")
             return jsonify({
                 'success': False,
                 'error': str(e)
@@ -324,28 +978,22 @@ def register_combat_routes(app):
     def process_enemy_action(combat_id):
         """AI decides and executes enemy action"""
         try:
-            data = request.json or {}
+            data = request.get_json(silent=True) or {}
             
             # Get combat from session
             combat = get_combat_from_session(combat_id)
             
             if not combat:
-                return jsonify({
-                    'success': False,
-                    'error': 'Combat not found'
-                }), 404
+                return _stock_error(_ERR_COMBAT_NOT_FOUND, 404)
             
             # Validate it's enemy turn
             current_turn = combat.get_current_participant()
-            if not current_turn or current_turn.participant_type.value != 'monster':
-                return jsonify({
-                    'success': False,
-                    'error': 'Not an enemy turn'
-                }), 400
+            if not current_turn or current_turn.participant_type is not ParticipantType.MONSTER:
+                return _stock_error(_ERR_NOT_ENEMY_TURN, 400)
             
             enemy_id = data.get('enemy_id', current_turn.participant_id)
 
-            print(f"[Combat API] Processing enemy action for: {enemy_id}")
+            log.debug("[Combat API] Processing enemy action for: %s", enemy_id)
             
             # Get enemy
             enemy = combat.get_participant_by_id(enemy_id)
@@ -357,22 +1005,14 @@ def register_combat_routes(app):
                 }), 400
             
             # Choose target - attack lowest HP player
-            available_targets = [
-                p for p in combat.participants
-                if p.participant_type.value == 'character' and p.is_alive()
-            ]
+            available_targets = [p for p in combat.character_participants if p.is_alive()]
             
             if not available_targets:
-                return jsonify({
-                    'success': False,
-                    'error': 'No valid targets available'
-                }), 400
+                return _stock_error(_ERR_NO_TARGETS, 400)
             
-            # Target lowest HP percentage
-            target = min(
-                available_targets,
-                key=lambda p: p.get_current_hp() / max(p.get_max_hp(), 1)
-            )
+            # Target lowest HP percentage (integer ratio, scaled by 1024)
+            hp_pairs = [(p.entity.hp, p.get_max_hp() or 1, p) for p in available_targets]
+            target = min(hp_pairs, key=lambda t: (t[0] << 10) // t[1])[2]
             
             # Resolve attack
             result = resolve_attack(enemy, target)
@@ -386,9 +1026,7 @@ def register_combat_routes(app):
             return jsonify(result)
             
         except Exception as e:
-            print(f"[API] Error processing enemy action: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[API] Error processing enemy action")
             return jsonify({
                 'success': False,
                 'error': str(e)
@@ -402,46 +1040,51 @@ def register_combat_routes(app):
             combat = get_combat_from_session(combat_id)
             
             if not combat:
-                return jsonify({
-                    'success': False,
-                    'error': 'Combat not found'
-                }), 404
+                return _stock_error(_ERR_COMBAT_NOT_FOUND, 404)
             
             # Store current round
             old_round = combat.current_round
             
+            order = combat.initiative_order
+            order_len = len(order)
+            get_participant = combat.get_participant_by_id
+            
             # Advance turn index
-            combat.current_turn_index += 1
+            turn_index = combat.current_turn_index + 1
             
             # Check if we need to start a new round
             new_round = False
-            if combat.current_turn_index >= len(combat.initiative_order):
-                combat.current_turn_index = 0
+            if turn_index >= order_len:
+                turn_index = 0
                 combat.current_round += 1
                 combat.total_rounds = combat.current_round
                 new_round = True
                 combat._log(f"--- Round {combat.current_round} ---")
             
-            # Skip dead participants
-            max_attempts = len(combat.initiative_order)
-            attempts = 0
-            while attempts < max_attempts:
-                current = combat.get_current_participant()
-                if current and current.is_alive():
+            # Skip dead participants (at most one full pass)
+            for _ in range(order_len):
+                current_participant = get_participant(order[turn_index][0])
+                if current_participant and current_participant.is_alive():
                     break
                 
                 # Skip this dead participant
-                combat.current_turn_index += 1
-                if combat.current_turn_index >= len(combat.initiative_order):
-                    combat.current_turn_index = 0
+                turn_index += 1
+                if turn_index >= order_len:
+                    turn_index = 0
                     combat.current_round += 1
                     new_round = True
-                
-                attempts += 1
+            else:
+                current_participant = get_participant(order[turn_index][0]) if order else None
             
             # Start the new turn
-            current_participant = combat.get_current_participant()
-            summary = combat.get_combat_summary()
+            combat.current_turn_index = turn_index
+            
+            # Clients already hold the participant list; only send the full
+            # summary when explicitly asked for (?full=1)
+            if request.args.get('full') == '1':
+                state_key, state = 'combat_state', combat.get_combat_summary()
+            else:
+                state_key, state = 'turn_delta', combat.get_turn_delta()
 
             if current_participant:
                 # Handle start-of-turn effects
@@ -463,13 +1106,11 @@ def register_combat_routes(app):
                     'name': current_participant.name if current_participant else None,
                     'type': current_participant.participant_type.value if current_participant else None
                 },
-                'combat_state': summary
+                state_key: state
             })
             
         except Exception as e:
-            print(f"[API] Error advancing turn: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[API] Error advancing turn")
             return jsonify({
                 'success': False,
                 'error': str(e)
@@ -479,20 +1120,16 @@ def register_combat_routes(app):
     def end_combat(combat_id):
         """Mark combat as complete"""
         try:
-            data = request.json
+            data = request.get_json(silent=True) or {}
             result = data.get('result', 'unknown')  # 'victory', 'defeat', 'flee'
             
             # Get combat from session
             combat = get_combat_from_session(combat_id)
             
             if not combat:
-                return jsonify({
-                    'success': False,
-                    'error': 'Combat not found'
-                }), 404
+                return _stock_error(_ERR_COMBAT_NOT_FOUND, 404)
             
             # Mark combat as ended
-            from component.GameState.combat_state import CombatPhase
             combat.combat_phase = CombatPhase.ENDED
             
             # Store result in metadata
@@ -506,8 +1143,8 @@ def register_combat_routes(app):
             if result == 'victory':
                 xp_gained = sum(
                     getattr(p.entity, 'xp', 0)
-                    for p in combat.participants
-                    if p.participant_type.value == 'monster' and not p.is_alive()
+                    for p in combat.monster_participants
+                    if not p.is_alive()
                 )
                 combat.metadata['xp_gained'] = xp_gained
                 
@@ -529,9 +1166,7 @@ def register_combat_routes(app):
             })
             
         except Exception as e:
-            print(f"[API] Error ending combat: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[API] Error ending combat")
             return jsonify({
                 'success': False,
                 'error': str(e)
@@ -545,24 +1180,20 @@ def register_combat_routes(app):
             combat = get_combat_from_session(combat_id)
             
             if not combat:
-                return jsonify({
-                    'success': False,
-                    'error': 'Combat not found'
-                }), 404
+                return _stock_error(_ERR_COMBAT_NOT_FOUND, 404)
             
             # In D&D 5e, fleeing requires a successful Dash action
             # For simplicity, we'll make it automatic for now
             # You could add a check here (e.g., party must succeed on group check)
             
             # Calculate flee chance (80% base for now)
-            flee_roll = random.randint(1, 100)
+            flee_roll = _d100()
             flee_success = flee_roll <= 80
             
             if flee_success:
                 combat._log("Party successfully fled from combat!")
                 
                 # Mark combat as ended via flee
-                from component.GameState.combat_state import CombatPhase
                 combat.combat_phase = CombatPhase.ENDED
                 
                 if not hasattr(combat, 'metadata'):
@@ -588,9 +1219,7 @@ def register_combat_routes(app):
                 })
             
         except Exception as e:
-            print(f"[API] Error fleeing: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("[API] Error fleeing")
             return jsonify({
                 'success': False,
                 'error': str(e)
@@ -604,7 +1233,7 @@ def register_combat_routes(app):
     def combat_state_complete(campaign_name):
         """Complete combat and advance story package tracker"""
         try:
-            data = request.json
+            data = request.get_json(silent=True) or {}
             result = data.get('result', 'victory')  # 'victory', 'defeat', 'fled'
             
             campaign, tracker, story_state, flow = load_story_package_data(campaign_name)
@@ -631,8 +1260,7 @@ def register_combat_routes(app):
             # Clear session combat
             combat_id = session.get('current_combat_id')
             if combat_id:
-                session_key = f'combat_{combat_id}'
-                session.pop(session_key, None)
+                delete_combat_from_session(combat_id)
                 session.pop('current_combat_id', None)
             
             # Advance tracker to next step
@@ -649,372 +1277,9 @@ def register_combat_routes(app):
             })
             
         except Exception as e:
-            print(f"Error completing combat: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error completing combat")
             return jsonify({'error': str(e)}), 500
     
-    # ========================================================================
-    # HELPER FUNCTIONS
-    # ========================================================================
-
-    
-    
-    def resolve_attack(attacker, target) -> dict:
-        """Resolve a basic attack action"""
-        import random
-        
-        print(f"[Combat] Resolving attack: {attacker.name} -> {target.name}")
-        
-        # Calculate attack roll (1d20 + modifiers)
-        attack_roll = random.randint(1, 20)
-        attack_bonus = get_attack_bonus(attacker)
-        total_attack = attack_roll + attack_bonus
-        
-        # Get target's AC
-        target_ac = target.get_ac()
-        
-        # Check for critical hit/miss
-        is_critical = attack_roll == 20
-        is_miss = attack_roll == 1 or (total_attack < target_ac and not is_critical)
-        
-        print(f"[Combat] Attack roll: {attack_roll} + {attack_bonus} = {total_attack} vs AC {target_ac}")
-        
-        if is_miss:
-            return {
-                'success': True,
-                'hit': False,
-                'message': f"{attacker.name} attacks {target.name} but misses! (Rolled {attack_roll}+{attack_bonus}={total_attack} vs AC {target_ac})",
-                'type': 'attack',
-                'attacker': attacker.name,
-                'target': target.participant_id,  # Use participant_id instead of name
-                'damage': 0,
-                'new_hp': target.get_current_hp(),
-                'max_hp': target.get_max_hp(),
-                'target_defeated': False,
-                'attack_roll': attack_roll,
-                'attack_bonus': attack_bonus,
-                'total_attack': total_attack,
-                'target_ac': target_ac
-            }
-        
-        # Calculate damage
-        damage = calculate_damage(attacker, is_critical)
-        
-        # Apply damage
-        new_hp = max(0, target.entity.hp - damage)
-        target.entity.hp = new_hp
-        
-        target_defeated = new_hp <= 0
-        crit_text = " CRITICAL HIT!" if is_critical else ""
-        
-        print(f"[Combat] Damage dealt: {damage}, new HP: {new_hp}/{target.get_max_hp()}")
-        
-        return {
-            'success': True,
-            'hit': True,
-            'critical': is_critical,
-            'message': f"{attacker.name} attacks {target.name} for {damage} damage!{crit_text}",
-            'type': 'attack',
-            'attacker': attacker.name,
-            'target': target.participant_id, 
-            'damage': damage,
-            'new_hp': new_hp,
-            'max_hp': target.get_max_hp(),
-            'target_defeated': target_defeated,
-            'attack_roll': attack_roll,
-            'attack_bonus': attack_bonus,
-            'total_attack': total_attack,
-            'target_ac': target_ac
-        }
-    
-
-    def resolve_defend(character) -> dict:
-        """Resolve a defend action"""
-        return {
-            'success': True,
-            'message': f"{character.name} takes a defensive stance! (+2 AC until next turn)",
-            'type': 'defend',
-            'character': character.name,
-            'effect': 'defending'
-        }
-    
-    def resolve_skill(character, skill_name, target, skill_data) -> dict:
-        """Resolve a character skill/ability"""
-        entity = character.entity
-        char_class = getattr(entity, 'char_class', None)
-        
-        # Route to class-specific handlers
-        if char_class == 'Barbarian':
-            return resolve_barbarian_skill(character, skill_name, target, skill_data)
-        elif char_class == 'Bard':
-            return resolve_bard_skill(character, skill_name, target, skill_data)
-        elif char_class == 'Cleric':
-            return resolve_cleric_skill(character, skill_name, target, skill_data)
-        elif char_class == 'Druid':
-            return resolve_druid_skill(character, skill_name, target, skill_data)
-        else:
-            return {
-                'success': False,
-                'error': f'Unknown character class: {char_class}'
-            }
-    
-    def resolve_barbarian_skill(character, skill_name, target, skill_data):
-        """Resolve Barbarian abilities"""
-        barbarian = character.entity
-        
-        if skill_name == 'Rage':
-            if barbarian.enter_rage():
-                return {
-                    'success': True,
-                    'message': f"{character.name} enters a RAGE! 🔥 (+{barbarian.rage_damage} damage, resistance)",
-                    'type': 'buff',
-                    'character': character.name,
-                    'effect': 'rage',
-                    'resource_changes': {
-                        'rages_remaining': barbarian.rages_per_day - barbarian.rages_used,
-                        'currently_raging': True
-                    }
-                }
-            else:
-                return {'success': False, 'error': 'No rage uses remaining!'}
-        
-        elif skill_name == 'Reckless Attack':
-            return {
-                'success': True,
-                'message': f"{character.name} attacks recklessly! (Advantage on attacks, enemies have advantage)",
-                'type': 'buff',
-                'character': character.name,
-                'effect': 'reckless'
-            }
-        
-        return {'success': False, 'error': f'Unknown Barbarian skill: {skill_name}'}
-    
-    def resolve_bard_skill(character, skill_name, target, skill_data):
-        """Resolve Bard abilities"""
-        bard = character.entity
-        
-        if skill_name == 'Bardic Inspiration':
-            if bard.use_bardic_inspiration():
-                return {
-                    'success': True,
-                    'message': f"{character.name} grants Bardic Inspiration to {target.name}! ({bard.bardic_inspiration_die})",
-                    'type': 'buff',
-                    'character': character.name,
-                    'target': target.participant_id,
-                    'effect': 'inspiration',
-                    'resource_changes': {
-                        'bardic_inspiration_remaining': bard.bardic_inspiration_remaining
-                    }
-                }
-            else:
-                return {'success': False, 'error': 'No Bardic Inspiration uses remaining!'}
-        
-        elif skill_name.startswith('Spell:'):
-            return resolve_spell(bard, character, skill_name, target, skill_data)
-        
-        return {'success': False, 'error': f'Unknown Bard skill: {skill_name}'}
-    
-    def resolve_cleric_skill(character, skill_name, target, skill_data):
-        """Resolve Cleric abilities"""
-        cleric = character.entity
-        
-        if skill_name == 'Channel Divinity: Turn Undead':
-            max_uses = 1 if cleric.level < 6 else (2 if cleric.level < 18 else 3)
-            if cleric.channel_divinity_used < max_uses:
-                cleric.channel_divinity_used += 1
-                return {
-                    'success': True,
-                    'message': f"{character.name} channels divinity to turn undead!",
-                    'type': 'effect',
-                    'character': character.name,
-                    'effect': 'turn_undead',
-                    'resource_changes': {
-                        'channel_divinity_remaining': max_uses - cleric.channel_divinity_used
-                    }
-                }
-            else:
-                return {'success': False, 'error': 'No Channel Divinity uses remaining!'}
-        
-        elif skill_name.startswith('Spell:'):
-            return resolve_spell(cleric, character, skill_name, target, skill_data)
-        
-        return {'success': False, 'error': f'Unknown Cleric skill: {skill_name}'}
-    
-    def resolve_druid_skill(character, skill_name, target, skill_data):
-        """Resolve Druid abilities"""
-        druid = character.entity
-        
-        if skill_name == 'Wild Shape':
-            beast_name = skill_data.get('beast_name', 'Wolf')
-            beast_hp = skill_data.get('beast_hp', 15)
-            
-            if druid.enter_wild_shape(beast_name, beast_hp):
-                return {
-                    'success': True,
-                    'message': f"{character.name} transforms into a {beast_name}!",
-                    'type': 'transform',
-                    'character': character.name,
-                    'effect': 'wild_shape',
-                    'resource_changes': {
-                        'wild_shape_remaining': druid.wild_shape_uses_remaining,
-                        'beast_name': beast_name,
-                        'beast_hp': beast_hp
-                    }
-                }
-            else:
-                return {'success': False, 'error': 'No Wild Shape uses remaining!'}
-        
-        elif skill_name.startswith('Spell:'):
-            return resolve_spell(druid, character, skill_name, target, skill_data)
-        
-        return {'success': False, 'error': f'Unknown Druid skill: {skill_name}'}
-    
-    def resolve_spell(caster_entity, character, skill_name, target, skill_data):
-        """Resolve spell casting"""
-        spell_name = skill_name.replace('Spell:', '').strip()
-        spell_level = skill_data.get('level', 1)
-        
-        # Check spell slots
-        used = caster_entity.spell_slots_used.get(spell_level, 0)
-        max_slots = caster_entity.spell_slots.get(spell_level, 0)
-        
-        if used >= max_slots:
-            return {'success': False, 'error': f'No level {spell_level} spell slots remaining!'}
-        
-        # Use spell slot
-        caster_entity.spell_slots_used[spell_level] = used + 1
-        
-        # Determine spell type
-        is_healing = any(word in spell_name.lower() for word in ['heal', 'cure', 'restore'])
-        
-        if is_healing:
-            # Healing spell
-            healing = random.randint(1, 8) * spell_level + get_spell_modifier(caster_entity)
-            
-            # Cleric life domain bonus
-            if hasattr(caster_entity, 'disciple_of_life') and caster_entity.disciple_of_life:
-                healing += 2 + spell_level
-            
-            target.entity.hp = min(target.entity.hp + healing, target.get_max_hp())
-            
-            return {
-                'success': True,
-                'message': f"{character.name} casts {spell_name} on {target.name}, healing {healing} HP!",
-                'type': 'healing',
-                'character': character.name,
-                'target': target.participant_id,
-                'healing': healing,
-                'new_hp': target.entity.hp,
-                'max_hp': target.get_max_hp(),
-                'resource_changes': {
-                    'spell_slots_used': caster_entity.spell_slots_used
-                }
-            }
-        else:
-            # Damage spell
-            damage = random.randint(2, 8) * spell_level
-            target.entity.hp = max(0, target.entity.hp - damage)
-            
-            return {
-                'success': True,
-                'message': f"{character.name} casts {spell_name} on {target.name} for {damage} damage!",
-                'type': 'damage',
-                'character': character.name,
-                'target': target.participant_id,
-                'damage': damage,
-                'new_hp': target.entity.hp,
-                'max_hp': target.get_max_hp(),
-                'target_defeated': target.entity.hp <= 0,
-                'resource_changes': {
-                    'spell_slots_used': caster_entity.spell_slots_used
-                }
-            }
-    
-    def get_attack_bonus(participant) -> int:
-        """Calculate attack bonus"""
-        entity = participant.entity
-        
-        if hasattr(entity, 'stats') and isinstance(entity.stats, dict):
-            str_score = entity.stats.get('strength', 10)
-            str_mod = (str_score - 10) // 2
-            prof_bonus = get_proficiency_bonus(getattr(entity, 'level', 1))
-            return str_mod + prof_bonus
-        
-        return 2  # Default
-    
-    def get_proficiency_bonus(level: int) -> int:
-        """Get proficiency bonus by level"""
-        if level < 5:
-            return 2
-        elif level < 9:
-            return 3
-        elif level < 13:
-            return 4
-        elif level < 17:
-            return 5
-        else:
-            return 6
-    
-    def get_spell_modifier(entity) -> int:
-        """Get spellcasting modifier"""
-        if hasattr(entity, 'stats') and isinstance(entity.stats, dict):
-            # Use wisdom for clerics/druids, charisma for bards
-            stat = 'wisdom' if getattr(entity, 'char_class') in ['Cleric', 'Druid'] else 'charisma'
-            score = entity.stats.get(stat, 10)
-            return (score - 10) // 2
-        return 0
-    
-    def calculate_damage(attacker, is_critical: bool = False) -> int:
-        """Calculate attack damage"""
-        entity = attacker.entity
-        
-        # Base damage (1d8 weapon)
-        base_dice = 1 if not is_critical else 2
-        damage = sum(random.randint(1, 8) for _ in range(base_dice))
-        
-        # Add STR modifier
-        if hasattr(entity, 'stats') and isinstance(entity.stats, dict):
-            str_score = entity.stats.get('strength', 10)
-            str_mod = (str_score - 10) // 2
-            damage += str_mod
-        
-        # Add rage damage if raging
-        if hasattr(entity, 'currently_raging') and entity.currently_raging:
-            damage += entity.rage_damage
-        
-        return max(1, damage)
-    
-    def get_combat_from_session(combat_id: str):
-        """Load combat from session with deserialization"""
-        session_key = f'combat_{combat_id}'
-        
-        if session_key not in session:
-            return None
-        
-        try:
-            combat_str = session[session_key]
-            return deserialize_combat(combat_str)
-        except Exception as e:
-            print(f"[Combat API] Error deserializing combat: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-    
-    def save_combat_to_session(combat_id: str, combat):
-        """Save combat to session with serialization"""
-        session_key = f'combat_{combat_id}'
-        
-        try:
-            combat_str = serialize_combat(combat)
-            session[session_key] = combat_str
-            session.modified = True
-        except Exception as e:
-            print(f"[Combat API] Error serializing combat: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
-    
     print("[Combat API] Routes registered successfully")
 
 
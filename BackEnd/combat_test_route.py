@@ -4,10 +4,11 @@ Combat Testing Routes
 Provides endpoints for testing combat initialization
 """
 
-from flask import render_template, request, jsonify, session
+from flask import Response, render_template, request, jsonify, session
 from datetime import datetime
 from pathlib import Path
 import json
+import logging
 import uuid
 
 # These will be imported when integrated
@@ -20,13 +21,151 @@ from component.Class.cleric import Cleric
 from component.Class.druid import Druid
 from component.Class.monsters.monster import Monster
 from component.GameState.dice_state import DiceRollState
+from combat_api_routes import get_combat_from_session, save_combat_to_session, delete_combat_from_session
+
+log = logging.getLogger(__name__)
+
+
+# Class, default background and default stats for each test character class
+CLASS_PRESETS = {
+    'Barbarian': (Barbarian, 'Soldier', {
+        'strength': 15, 'dexterity': 14, 'constitution': 14,
+        'intelligence': 10, 'wisdom': 12, 'charisma': 8
+    }),
+    'Bard': (Bard, 'Entertainer', {
+        'strength': 8, 'dexterity': 14, 'constitution': 12,
+        'intelligence': 10, 'wisdom': 13, 'charisma': 15
+    }),
+    'Cleric': (Cleric, 'Acolyte', {
+        'strength': 10, 'dexterity': 12, 'constitution': 14,
+        'intelligence': 11, 'wisdom': 16, 'charisma': 13
+    }),
+    'Druid': (Druid, 'Outlander', {
+        'strength': 10, 'dexterity': 13, 'constitution': 14,
+        'intelligence': 12, 'wisdom': 15, 'charisma': 8
+    }),
+}
+
+# Used for any class without a preset
+DEFAULT_CLASS_PRESET = (Character, 'Folk Hero', {
+    'strength': 12, 'dexterity': 12, 'constitution': 12,
+    'intelligence': 12, 'wisdom': 12, 'charisma': 12
+})
+
+
+# Stats for monsters created without any
+DEFAULT_MONSTER_STATS = {
+    'strength': 10, 'dexterity': 10, 'constitution': 10,
+    'intelligence': 10, 'wisdom': 10, 'charisma': 10
+}
+
+
+# Preset monster templates; fixed, so the response body is encoded once
+MONSTER_PRESETS = {
+    'goblin': {
+        'name': 'Goblin',
+        'monster_type': 'Humanoid',
+        'size': 'Small',
+        'alignment': 'Neutral Evil',
+        'challenge_rating': 0.25,
+        'hp': 7,
+        'ac': 15,
+        'stats': {
+            'strength': 8,
+            'dexterity': 14,
+            'constitution': 10,
+            'intelligence': 10,
+            'wisdom': 8,
+            'charisma': 8
+        },
+        'abilities': ['Nimble Escape'],
+        'actions': ['Scimitar (1d6+2)', 'Shortbow (1d6+2)']
+    },
+    'goblin_boss': {
+        'name': 'Goblin Boss',
+        'monster_type': 'Humanoid',
+        'size': 'Small',
+        'alignment': 'Neutral Evil',
+        'challenge_rating': 1,
+        'hp': 21,
+        'ac': 17,
+        'stats': {
+            'strength': 10,
+            'dexterity': 14,
+            'constitution': 10,
+            'intelligence': 10,
+            'wisdom': 8,
+            'charisma': 10
+        },
+        'abilities': ['Redirect Attack'],
+        'actions': ['Multiattack', 'Scimitar (1d6+2)', 'Javelin (1d6+2)']
+    },
+    'orc': {
+        'name': 'Orc',
+        'monster_type': 'Humanoid',
+        'size': 'Medium',
+        'alignment': 'Chaotic Evil',
+        'challenge_rating': 0.5,
+        'hp': 15,
+        'ac': 13,
+        'stats': {
+            'strength': 16,
+            'dexterity': 12,
+            'constitution': 16,
+            'intelligence': 7,
+            'wisdom': 11,
+            'charisma': 10
+        },
+        'abilities': ['Aggressive'],
+        'actions': ['Greataxe (1d12+3)', 'Javelin (1d6+3)']
+    },
+    'wolf': {
+        'name': 'Wolf',
+        'monster_type': 'Beast',
+        'size': 'Medium',
+        'alignment': 'Unaligned',
+        'challenge_rating': 0.25,
+        'hp': 11,
+        'ac': 13,
+        'stats': {
+            'strength': 12,
+            'dexterity': 15,
+            'constitution': 12,
+            'intelligence': 3,
+            'wisdom': 12,
+            'charisma': 6
+        },
+        'abilities': ['Keen Hearing and Smell', 'Pack Tactics'],
+        'actions': ['Bite (2d4+2)']
+    },
+    'skeleton': {
+        'name': 'Skeleton',
+        'monster_type': 'Undead',
+        'size': 'Medium',
+        'alignment': 'Lawful Evil',
+        'challenge_rating': 0.25,
+        'hp': 13,
+        'ac': 13,
+        'stats': {
+            'strength': 10,
+            'dexterity': 14,
+            'constitution': 15,
+            'intelligence': 6,
+            'wisdom': 8,
+            'charisma': 5
+        },
+        'abilities': ['Damage Vulnerabilities: Bludgeoning'],
+        'actions': ['Shortsword (1d6+2)', 'Shortbow (1d6+2)']
+    }
+}
+
+_MONSTER_PRESETS_BODY = json.dumps({'presets': MONSTER_PRESETS}, separators=(',', ':')).encode('utf-8')
 
 
 def register_combat_test_routes(app):
     """Register combat testing routes"""
     
-    # Store active combat sessions in memory (use Redis/DB for production)
-    active_combats = {}
+    # Combats live in the shared combat store (see combat_api_routes)
     
     @app.route('/combat-test')
     def combat_test_page():
@@ -38,7 +177,7 @@ def register_combat_test_routes(app):
     def create_combat():
         """Create a new combat encounter"""
         try:
-            data = request.json
+            data = request.get_json(silent=True) or {}
             
             encounter_name = data.get('encounter_name', 'Test Encounter')
             characters_data = data.get('characters', [])
@@ -49,68 +188,20 @@ def register_combat_test_routes(app):
             for char_data in characters_data:
                 # Determine class type
                 class_type = char_data.get('char_class', 'Character')
+                char_cls, default_background, default_stats = CLASS_PRESETS.get(
+                    class_type, DEFAULT_CLASS_PRESET
+                )
                 
                 # Create appropriate character class
-                if class_type == 'Barbarian':
-                    char = Barbarian(
-                        name=char_data['name'],
-                        race=char_data.get('race', 'Human'),
-                        char_class=class_type,
-                        background=char_data.get('background', 'Soldier'),
-                        level=char_data.get('level', 1),
-                        stats=char_data.get('stats', {
-                            'strength': 15, 'dexterity': 14, 'constitution': 14,
-                            'intelligence': 10, 'wisdom': 12, 'charisma': 8
-                        })
-                    )
-                elif class_type == 'Bard':
-                    char = Bard(
-                        name=char_data['name'],
-                        race=char_data.get('race', 'Human'),
-                        char_class=class_type,
-                        background=char_data.get('background', 'Entertainer'),
-                        level=char_data.get('level', 1),
-                        stats=char_data.get('stats', {
-                            'strength': 8, 'dexterity': 14, 'constitution': 12,
-                            'intelligence': 10, 'wisdom': 13, 'charisma': 15
-                        })
-                    )
-                elif class_type == 'Cleric':
-                    char = Cleric(
-                        name=char_data['name'],
-                        race=char_data.get('race', 'Human'),
-                        char_class=class_type,
-                        background=char_data.get('background', 'Acolyte'),
-                        level=char_data.get('level', 1),
-                        stats=char_data.get('stats', {
-                            'strength': 10, 'dexterity': 12, 'constitution': 14,
-                            'intelligence': 11, 'wisdom': 16, 'charisma': 13
-                        })
-                    )
-                elif class_type == 'Druid':
-                    char = Druid(
-                        name=char_data['name'],
-                        race=char_data.get('race', 'Human'),
-                        char_class=class_type,
-                        background=char_data.get('background', 'Outlander'),
-                        level=char_data.get('level', 1),
-                        stats=char_data.get('stats', {
-                            'strength': 10, 'dexterity': 13, 'constitution': 14,
-                            'intelligence': 12, 'wisdom': 15, 'charisma': 8
-                        })
-                    )
-                else:
-                    char = Character(
-                        name=char_data['name'],
-                        race=char_data.get('race', 'Human'),
-                        char_class=class_type,
-                        background=char_data.get('background', 'Folk Hero'),
-                        level=char_data.get('level', 1),
-                        stats=char_data.get('stats', {
-                            'strength': 12, 'dexterity': 12, 'constitution': 12,
-                            'intelligence': 12, 'wisdom': 12, 'charisma': 12
-                        })
-                    )
+                char = char_cls(
+                    name=char_data['name'],
+                    race=char_data.get('race', 'Human'),
+                    char_class=class_type,
+                    background=char_data.get('background', default_background),
+                    level=char_data.get('level', 1),
+                    # Copy the preset: characters may change their own stats
+                    stats=char_data['stats'] if 'stats' in char_data else dict(default_stats)
+                )
                 
                 char.hp = char_data.get('hp', char.max_hp)
                 char.ac = char_data.get('ac', 10)
@@ -127,10 +218,7 @@ def register_combat_test_routes(app):
                     challenge_rating=monster_data.get('challenge_rating', 0.5),
                     hp=monster_data.get('hp', 10),
                     ac=monster_data.get('ac', 12),
-                    stats=monster_data.get('stats', {
-                        'strength': 10, 'dexterity': 10, 'constitution': 10,
-                        'intelligence': 10, 'wisdom': 10, 'charisma': 10
-                    }),
+                    stats=monster_data['stats'] if 'stats' in monster_data else dict(DEFAULT_MONSTER_STATS),
                     abilities=monster_data.get('abilities', []),
                     actions=monster_data.get('actions', [])
                 )
@@ -143,8 +231,8 @@ def register_combat_test_routes(app):
                 monsters=monsters
             )
             
-            # Store in active combats
-            active_combats[combat.combat_id] = combat
+            # Store in the combat store
+            save_combat_to_session(combat.combat_id, combat)
             
             return jsonify({
                 'success': True,
@@ -155,21 +243,20 @@ def register_combat_test_routes(app):
             })
             
         except Exception as e:
-            print(f"Error creating combat: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error creating combat")
             return jsonify({'error': str(e)}), 400
     
     
     @app.route('/api/combat/<combat_id>/roll-initiative', methods=['POST'])
     def roll_initiative(combat_id):
         """Roll initiative for all participants"""
+        combat = get_combat_from_session(combat_id)
+        if not combat:
+            return jsonify({'error': 'Combat not found'}), 404
+        
         try:
-            combat = active_combats.get(combat_id)
-            if not combat:
-                return jsonify({'error': 'Combat not found'}), 404
-            
             results = combat.roll_initiative()
+            save_combat_to_session(combat_id, combat)
             
             return jsonify({
                 'success': True,
@@ -178,23 +265,26 @@ def register_combat_test_routes(app):
             })
             
         except Exception as e:
+            log.exception("Error rolling initiative")
             return jsonify({'error': str(e)}), 400
     
     
     @app.route('/api/combat/<combat_id>/determine-order', methods=['POST'])
     def determine_order(combat_id):
         """Determine turn order"""
+        combat = get_combat_from_session(combat_id)
+        if not combat:
+            return jsonify({'error': 'Combat not found'}), 404
+        
         try:
-            combat = active_combats.get(combat_id)
-            if not combat:
-                return jsonify({'error': 'Combat not found'}), 404
-            
             combat.determine_turn_order()
+            save_combat_to_session(combat_id, combat)
             
             # Build order data
             order = []
+            get_participant = combat.get_participant_by_id
             for i, (participant_id, init_total) in enumerate(combat.initiative_order, 1):
-                participant = combat.get_participant_by_id(participant_id)
+                participant = get_participant(participant_id)
                 order.append({
                     'position': i,
                     'participant_id': participant_id,
@@ -210,18 +300,20 @@ def register_combat_test_routes(app):
             })
             
         except Exception as e:
+            log.exception("Error determining turn order")
             return jsonify({'error': str(e)}), 400
     
     
     @app.route('/api/combat/<combat_id>/start', methods=['POST'])
     def start_combat(combat_id):
         """Start the combat"""
+        combat = get_combat_from_session(combat_id)
+        if not combat:
+            return jsonify({'error': 'Combat not found'}), 404
+        
         try:
-            combat = active_combats.get(combat_id)
-            if not combat:
-                return jsonify({'error': 'Combat not found'}), 404
-            
             combat.init_combat()
+            save_combat_to_session(combat_id, combat)
             
             current = combat.get_current_participant()
             
@@ -236,17 +328,18 @@ def register_combat_test_routes(app):
             })
             
         except Exception as e:
+            log.exception("Error starting combat")
             return jsonify({'error': str(e)}), 400
     
     
     @app.route('/api/combat/<combat_id>/summary', methods=['GET'])
     def get_combat_summary(combat_id):
         """Get combat summary"""
+        combat = get_combat_from_session(combat_id)
+        if not combat:
+            return jsonify({'error': 'Combat not found'}), 404
+        
         try:
-            combat = active_combats.get(combat_id)
-            if not combat:
-                return jsonify({'error': 'Combat not found'}), 404
-            
             summary = combat.get_combat_summary()
             
             return jsonify({
@@ -255,6 +348,7 @@ def register_combat_test_routes(app):
             })
             
         except Exception as e:
+            log.exception("Error building combat summary")
             return jsonify({'error': str(e)}), 400
     
     
@@ -262,114 +356,17 @@ def register_combat_test_routes(app):
     def delete_combat(combat_id):
         """Delete a combat"""
         try:
-            if combat_id in active_combats:
-                del active_combats[combat_id]
+            if get_combat_from_session(combat_id) is not None:
+                delete_combat_from_session(combat_id)
                 return jsonify({'success': True})
             return jsonify({'error': 'Combat not found'}), 404
             
         except Exception as e:
+            log.exception("Error deleting combat")
             return jsonify({'error': str(e)}), 400
     
     
     @app.route('/api/monsters/presets', methods=['GET'])
     def get_monster_presets():
         """Get preset monster templates"""
-        presets = {
-            'goblin': {
-                'name': 'Goblin',
-                'monster_type': 'Humanoid',
-                'size': 'Small',
-                'alignment': 'Neutral Evil',
-                'challenge_rating': 0.25,
-                'hp': 7,
-                'ac': 15,
-                'stats': {
-                    'strength': 8,
-                    'dexterity': 14,
-                    'constitution': 10,
-                    'intelligence': 10,
-                    'wisdom': 8,
-                    'charisma': 8
-                },
-                'abilities': ['Nimble Escape'],
-                'actions': ['Scimitar (1d6+2)', 'Shortbow (1d6+2)']
-            },
-            'goblin_boss': {
-                'name': 'Goblin Boss',
-                'monster_type': 'Humanoid',
-                'size': 'Small',
-                'alignment': 'Neutral Evil',
-                'challenge_rating': 1,
-                'hp': 21,
-                'ac': 17,
-                'stats': {
-                    'strength': 10,
-                    'dexterity': 14,
-                    'constitution': 10,
-                    'intelligence': 10,
-                    'wisdom': 8,
-                    'charisma': 10
-                },
-                'abilities': ['Redirect Attack'],
-                'actions': ['Multiattack', 'Scimitar (1d6+2)', 'Javelin (1d6+2)']
-            },
-            'orc': {
-                'name': 'Orc',
-                'monster_type': 'Humanoid',
-                'size': 'Medium',
-                'alignment': 'Chaotic Evil',
-                'challenge_rating': 0.5,
-                'hp': 15,
-                'ac': 13,
-                'stats': {
-                    'strength': 16,
-                    'dexterity': 12,
-                    'constitution': 16,
-                    'intelligence': 7,
-                    'wisdom': 11,
-                    'charisma': 10
-                },
-                'abilities': ['Aggressive'],
-                'actions': ['Greataxe (1d12+3)', 'Javelin (1d6+3)']
-            },
-            'wolf': {
-                'name': 'Wolf',
-                'monster_type': 'Beast',
-                'size': 'Medium',
-                'alignment': 'Unaligned',
-                'challenge_rating': 0.25,
-                'hp': 11,
-                'ac': 13,
-                'stats': {
-                    'strength': 12,
-                    'dexterity': 15,
-                    'constitution': 12,
-                    'intelligence': 3,
-                    'wisdom': 12,
-                    'charisma': 6
-                },
-                'abilities': ['Keen Hearing and Smell', 'Pack Tactics'],
-                'actions': ['Bite (2d4+2)']
-            },
-            'skeleton': {
-                'name': 'Skeleton',
-                'monster_type': 'Undead',
-                'size': 'Medium',
-                'alignment': 'Lawful Evil',
-                'challenge_rating': 0.25,
-                'hp': 13,
-                'ac': 13,
-                'stats': {
-                    'strength': 10,
-                    'dexterity': 14,
-                    'constitution': 15,
-                    'intelligence': 6,
-                    'wisdom': 8,
-                    'charisma': 5
-                },
-                'abilities': ['Damage Vulnerabilities: Bludgeoning'],
-                'actions': ['Shortsword (1d6+2)', 'Shortbow (1d6+2)']
-            }
-        }
-        
-        return jsonify({'presets': presets})
\ No newline at end of file
+        return Response(_MONSTER_PRESETS_BODY, mimetype='application/json')
@@ -6,19 +6,24 @@ import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 import shutil
 
+_DEFAULT_STATS: Dict[str, int] = {
+    "strength": 10,
+    "dexterity": 10,
+    "constitution": 10,
+    "intelligence": 10,
+    "wisdom": 10,
+    "charisma": 10
+}
+
 def default_stats() -> Dict[str, int]:
-    return {
-        "strength": 10,
-        "dexterity": 10,
-        "constitution": 10,
-        "intelligence": 10,
-        "wisdom": 10,
-        "charisma": 10
-    } # type: ignore
+    # Copy: every character owns (and may change) its stats dict
+    return _DEFAULT_STATS.copy()
 
+# Not slotted: campaign characters load as plain Character objects, and
+# combat code attaches class resources (spell_slots_used, ...) to them
 @dataclass
 class Character:
     """Player character data - ENHANCED with full D&D 5e character sheet"""
@@ -54,19 +59,36 @@ class Character:
     def __post_init__(self):
         # Ensure stats uses the expected key names (in case older data used different structure)
         if not isinstance(self.stats, dict):
-            self.stats = {
-                "strength": 10,
-                "dexterity": 10,
-                "constitution": 10,
-                "intelligence": 10,
-                "wisdom": 10,
-                "charisma": 10
-            }
+            self.stats = default_stats()
     
 
+# Field names per Character (sub)class, filled on first serialization
+_FIELD_NAMES: Dict[type, tuple] = {}
+
+
+def fields_to_dict(character: Character) -> Dict:
+    """Copy a Character's (or subclass's) dataclass fields into a new dict"""
+    cls = character.__class__
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    
+    # Character fields are flat, so shallow-copying the lists and dicts
+    # gives the same result as asdict() without its recursive deepcopy
+    char_dict = {}
+    for name in names:
+        value = getattr(character, name)
+        if value.__class__ is list:
+            value = list(value)
+        elif value.__class__ is dict:
+            value = dict(value)
+        char_dict[name] = value
+    return char_dict
+
+
 def character_to_dict(character: Character) -> Dict:
     """Convert Character to dict with class type metadata for serialization"""
-    char_dict = asdict(character)
+    char_dict = fields_to_dict(character)
     # Add class type metadata to support potential Character subclasses
     char_dict['_class_type'] = character.__class__.__name__
     return char_dict
@@ -4,59 +4,42 @@ Class Registry and Factory System
 Handles creation and serialization of class-specific Character objects
 """
 
-from typing import Dict, Type, Any, Optional, TYPE_CHECKING, cast
-from dataclasses import asdict
-
-# Class globals are initialized lazily; annotate for the type checker
-Barbarian: Optional[Type[Any]] = None
-Bard: Optional[Type[Any]] = None
-Cleric: Optional[Type[Any]] = None
-Druid: Optional[Type[Any]] = None
-
-
-if TYPE_CHECKING:
-    # Help static type checkers know the real classes without importing at runtime
-    from barbarian import Barbarian as _Barbarian
-    from bard import Bard as _Bard
-    from cleric import Cleric as _Cleric
-    from druid import Druid as _Druid
-    
+import sys
+from pathlib import Path
+from typing import Dict, Type, Any
+from dataclasses import fields
+
+# The class modules import their base as Class.Character, so component/
+# must be importable before the registry is built below
+_COMPONENT_DIR = str(Path(__file__).resolve().parents[1])
+if _COMPONENT_DIR not in sys.path:
+    sys.path.insert(0, _COMPONENT_DIR)
+
+from .Character import fields_to_dict
 
 
 # ============================================================================
-# LAZY IMPORT HELPERS
+# CLASS IMPORT HELPERS
 # ===========================================================================
 
 def _import_barbarian():
-    """Lazy import Barbarian to avoid circular dependency"""
-    global Barbarian
-    if Barbarian is None:
-        from .barbarian import Barbarian as BarbarianClass
-        Barbarian = BarbarianClass
+    """Import the Barbarian class for the registry"""
+    from .barbarian import Barbarian
     return Barbarian
 
 def _import_bard():
-    """Lazy import Bard to avoid circular dependency"""
-    global Bard
-    if Bard is None:
-        from .bard import Bard as BardClass
-        Bard = BardClass
+    """Import the Bard class for the registry"""
+    from .bard import Bard
     return Bard
 
 def _import_cleric():
-    """Lazy import Cleric to avoid circular dependency"""
-    global Cleric
-    if Cleric is None:
-        from .cleric import Cleric as ClericClass
-        Cleric = ClericClass
+    """Import the Cleric class for the registry"""
+    from .cleric import Cleric
     return Cleric
 
 def _import_druid():
-    """Lazy import Druid to avoid circular dependency"""
-    global Druid
-    if Druid is None:
-        from .druid import Druid as DruidClass
-        Druid = DruidClass
+    """Import the Druid class for the registry"""
+    from .druid import Druid
     return Druid
 
 
@@ -65,33 +48,29 @@ def _import_druid():
 # CLASS REGISTRY
 # ============================================================================
 
-# Registry mapping class names to class types
-# Character base class added lazily to avoid circular import
+# Registry mapping class names to class types; filled once at import (see below)
 
 CLASS_REGISTRY: Dict[str, Type] = {}
 
+# Constructor field names for each registered class, used to drop stale keys
+_INIT_FIELDS: Dict[Type, frozenset] = {}
+
+def _register(name: str, cls: Type):
+    """Add a class to the registry along with its constructor field names"""
+    CLASS_REGISTRY[name] = cls
+    _INIT_FIELDS[cls] = frozenset(f.name for f in fields(cls) if f.init)
+
 def _initialize_registry():
     """Initialize the registry with all available classes"""
     if not CLASS_REGISTRY:
-        _import_barbarian()
-        _import_bard()
-        _import_cleric()
-        _import_druid()
- 
-
-        if Barbarian:
-            CLASS_REGISTRY["Barbarian"] = Barbarian
-        if Bard:
-            CLASS_REGISTRY["Bard"] = Bard
-        if Cleric:
-            CLASS_REGISTRY["Cleric"] = Cleric
-        if Druid:
-            CLASS_REGISTRY["Druid"] = Druid
-
+        _register("Barbarian", _import_barbarian())
+        _register("Bard", _import_bard())
+        _register("Cleric", _import_cleric())
+        _register("Druid", _import_druid())
 
 
 def _get_base_character_class():
-    """Lazy import of base Character class to avoid circular dependency"""
+    """Import the base Character class for the registry"""
     from .Character import Character
     return Character
 
@@ -100,7 +79,7 @@ def _ensure_character_in_registry():
     """Add Character to registry if not already present"""
     _initialize_registry()
     if "Character" not in CLASS_REGISTRY:
-        CLASS_REGISTRY["Character"] = _get_base_character_class()
+        _register("Character", _get_base_character_class())
 
 
 # ============================================================================
@@ -108,18 +87,34 @@ def _ensure_character_in_registry():
 # ============================================================================
 
 
+def get_character_class(class_type: str) -> Type:
+    """
+    Look up the class registered for a class name.
+    
+    Args:
+        class_type: Name of the class (e.g. 'Barbarian')
+    
+    Returns:
+        The registered class, or the base Character class if unknown
+    """
+    return _REG_GET(class_type, _BASE_CHARACTER)
+
+
 def create_character(class_type: str, **kwargs):
     """
     Factory function to create a character of the specified class type.
     """
-    # Ensure Character is in registry
-    _ensure_character_in_registry()
-    
+    return _build_character(class_type, kwargs)
+
+
+def _build_character(class_type: str, data: Dict[str, Any]):
+    """Instantiate class_type from data without modifying data"""
     # Get the class from registry, default to base Character if not found
-    character_class = CLASS_REGISTRY.get(class_type, CLASS_REGISTRY["Character"])
+    character_class = get_character_class(class_type)
     
-    # Remove class_type from kwargs if present (it's metadata, not a field)
-    kwargs.pop('class_type', None)
+    # Keep only constructor fields (drops class_type metadata and stale keys)
+    valid = _INIT_FIELDS[character_class]
+    kwargs = {k: v for k, v in data.items() if k in valid}
     
     # ✅ FIX: Add char_class if not present (defaults to class_type)
     # This is required by the Character dataclass
@@ -146,13 +141,10 @@ def character_to_dict(character) -> Dict[str, Any]:
         >>> data['class_type']
         'Barbarian'
     """
-    # Get character data as dict (cast to help static type checkers)
-    char_dict: Dict[str, Any] = cast(Dict[str, Any], asdict(character))
+    char_dict = fields_to_dict(character)
 
     # Add class_type metadata
-    # Determine the actual class type
-    class_name = type(character).__name__
-    char_dict['class_type'] = class_name
+    char_dict['class_type'] = type(character).__name__
 
     return char_dict
 
@@ -174,16 +166,12 @@ def character_from_dict(data: Dict[str, Any]):
         >>> isinstance(character, Barbarian)
         True
     """
-    # Extract class_type metadata (default to infer from char_class field)
-    class_type = data.get('class_type')
+    # Extract class_type metadata; for backward compatibility, infer it
+    # from char_class when missing
+    class_type = data.get('class_type') or data.get('char_class', 'Character')
     
-    # Backward compatibility: If no class_type, try to infer from char_class
-    if not class_type:
-        class_type = data.get('char_class', 'Character')
-    data_copy = data.copy()
-    data_copy.pop('class_type', None)
-    
-    return create_character(class_type, **data_copy)
+    # The field filter drops the class_type key, so no copy is needed
+    return _build_character(class_type, data)
 
 
 def get_available_classes() -> list:
@@ -198,7 +186,6 @@ def get_available_classes() -> list:
         >>> 'Barbarian' in classes
         True
     """
-    _ensure_character_in_registry()
     return list(CLASS_REGISTRY.keys())
 
 
@@ -218,16 +205,30 @@ def is_class_available(class_name: str) -> bool:
         >>> is_class_available('FakeClass')
         False
     """
-    _ensure_character_in_registry()
     return class_name in CLASS_REGISTRY
 
 
+# Build the registry once at import; the lookups above assume it is filled
+_ensure_character_in_registry()
+
+# Bound once for get_character_class, which runs per created character
+_REG_GET = CLASS_REGISTRY.get
+_BASE_CHARACTER = CLASS_REGISTRY["Character"]
+
+# Exported class names, bound from the registry
+Barbarian = CLASS_REGISTRY["Barbarian"]
+Bard = CLASS_REGISTRY["Bard"]
+Cleric = CLASS_REGISTRY["Cleric"]
+Druid = CLASS_REGISTRY["Druid"]
+
+
 # ============================================================================
 # EXPORTS
 # ============================================================================
 
 __all__ = [
     'CLASS_REGISTRY',
+    'get_character_class',
     'create_character',
     'character_to_dict',
     'character_from_dict',
@@ -239,110 +240,3 @@ __all__ = [
     'Cleric',
     'Druid',
 ]
-
-
-# ============================================================================
-# TESTING
-# ============================================================================
-
-if __name__ == "__main__":
-    print("=" * 60)
-    print("CLASS REGISTRY TEST")
-    print("=" * 60)
-    
-    print(f"\nAvailable classes: {get_available_classes()}")
-    
-    # Test 1: Create a Barbarian
-    print("\n" + "-" * 60)
-    print("Test 1: Create Barbarian using factory")
-    print("-" * 60)
-    
-    barbarian = create_character(
-        class_type="Barbarian",
-        name="Grog Strongjaw",
-        race="Goliath",
-        char_class="Barbarian",
-        background="Outlander",
-        level=5
-    )
-    bard = create_character(
-        class_type="Bard",
-        name="Jester Lavorre",
-        race="Tiefling",
-        char_class="Bard",
-        background="Entertainer",
-        level=5
-    )
-    
-    
-    print(f"Created: {barbarian}")
-    print(f"Type: {type(barbarian).__name__}")
-    print(f"Is Barbarian: {Barbarian is not None and isinstance(barbarian, Barbarian)}")
-    print(f"Rages per day: {barbarian.rages_per_day}")
-    print(f"Rage damage: {barbarian.rage_damage}")
-    
-    # Test 2: Serialize to dict
-    print("\n" + "-" * 60)
-    print("Test 2: Serialize to dictionary")
-    print("-" * 60)
-    
-    char_dict = character_to_dict(barbarian)
-    print(f"class_type in dict: {char_dict.get('class_type')}")
-    print(f"name in dict: {char_dict.get('name')}")
-    print(f"rages_per_day in dict: {char_dict.get('rages_per_day')}")
-    
-    # Test 3: Deserialize from dict
-    print("\n" + "-" * 60)
-    print("Test 3: Deserialize from dictionary")
-    print("-" * 60)
-    
-    restored_char = character_from_dict(char_dict)
-    print(f"Restored: {restored_char}")
-    print(f"Type: {type(restored_char).__name__}")
-    print(f"Is Barbarian: {Barbarian is not None and isinstance(restored_char, Barbarian)}")
-    print(f"Name matches: {restored_char.name == barbarian.name}")
-    print(f"Rages match: {restored_char.rages_per_day == barbarian.rages_per_day}")
-    
-    # Test 4: Backward compatibility
-    print("\n" + "-" * 60)
-    print("Test 4: Backward compatibility (no class_type field)")
-    print("-" * 60)
-    
-    old_format_data = {
-        'name': 'Old Character',
-        'char_class': 'Barbarian',
-        'race': 'Human',
-        'background': 'Soldier',
-        'level': 1
-    }
-    
-    old_char = character_from_dict(old_format_data)
-    print(f"Created from old format: {old_char}")
-    print(f"Type: {type(old_char).__name__}")
-    print(f"Is Barbarian: {Barbarian is not None and isinstance(old_char, Barbarian)}")
-    
-    # Test 5: Unknown class defaults to Character
-    print("\n" + "-" * 60)
-    print("Test 5: Unknown class defaults to Character")
-    print("-" * 60)
-    
-    unknown_data = {
-        'name': 'Unknown Class',
-        'class_type': 'FakeClass',
-        'char_class': 'FakeClass',
-        'race': 'Human',
-        'background': 'Folk Hero',
-        'level': 1
-    }
-    
-    unknown_char = character_from_dict(unknown_data)
-    print(f"Created: {unknown_char}")
-    print(f"Type: {type(unknown_char).__name__}")
-    
-    # Import Character for final test
-    Character = _get_base_character_class()
-    print(f"Is base Character: {type(unknown_char) == Character}")
-    
-    print("\n" + "=" * 60)
-    print("✓ All tests completed")
-    print("=" * 60)
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Class registry self-test
+
+Run from BackEnd/ with: python -m component.Class._selftest
+"""
+
+from . import (
+    Barbarian,
+    create_character,
+    character_to_dict,
+    character_from_dict,
+    get_available_classes,
+    get_character_class,
+)
+
+
+def main():
+    print("=" * 60)
+    print("CLASS REGISTRY TEST")
+    print("=" * 60)
+    
+    print(f"\nAvailable classes: {get_available_classes()}")
+    
+    # Test 1: Create a Barbarian
+    print("\n" + "-" * 60)
+    print("Test 1: Create Barbarian using factory")
+    print("-" * 60)
+    
+    barbarian = create_character(
+        class_type="Barbarian",
+        name="Grog Strongjaw",
+        race="Goliath",
+        char_class="Barbarian",
+        background="Outlander",
+        level=5
+    )
+    bard = create_character(
+        class_type="Bard",
+        name="Jester Lavorre",
+        race="Tiefling",
+        char_class="Bard",
+        background="Entertainer",
+        level=5
+    )
+    
+    
+    print(f"Created: {barbarian}")
+    print(f"Type: {type(barbarian).__name__}")
+    print(f"Is Barbarian: {isinstance(barbarian, Barbarian)}")
+    print(f"Rages per day: {barbarian.rages_per_day}")
+    print(f"Rage damage: {barbarian.rage_damage}")
+    
+    # Test 2: Serialize to dict
+    print("\n" + "-" * 60)
+    print("Test 2: Serialize to dictionary")
+    print("-" * 60)
+    
+    char_dict = character_to_dict(barbarian)
+    print(f"class_type in dict: {char_dict.get('class_type')}")
+    print(f"name in dict: {char_dict.get('name')}")
+    print(f"rages_per_day in dict: {char_dict.get('rages_per_day')}")
+    
+    # Test 3: Deserialize from dict
+    print("\n" + "-" * 60)
+    print("Test 3: Deserialize from dictionary")
+    print("-" * 60)
+    
+    restored_char = character_from_dict(char_dict)
+    print(f"Restored: {restored_char}")
+    print(f"Type: {type(restored_char).__name__}")
+    print(f"Is Barbarian: {isinstance(restored_char, Barbarian)}")
+    print(f"Name matches: {restored_char.name == barbarian.name}")
+    print(f"Rages match: {restored_char.rages_per_day == barbarian.rages_per_day}")
+    
+    # Test 4: Backward compatibility
+    print("\n" + "-" * 60)
+    print("Test 4: Backward compatibility (no class_type field)")
+    print("-" * 60)
+    
+    old_format_data = {
+        'name': 'Old Character',
+        'char_class': 'Barbarian',
+        'race': 'Human',
+        'background': 'Soldier',
+        'level': 1
+    }
+    
+    old_char = character_from_dict(old_format_data)
+    print(f"Created from old format: {old_char}")
+    print(f"Type: {type(old_char).__name__}")
+    print(f"Is Barbarian: {isinstance(old_char, Barbarian)}")
+    
+    # Test 5: Unknown class defaults to Character
+    print("\n" + "-" * 60)
+    print("Test 5: Unknown class defaults to Character")
+    print("-" * 60)
+    
+    unknown_data = {
+        'name': 'Unknown Class',
+        'class_type': 'FakeClass',
+        'char_class': 'FakeClass',
+        'race': 'Human',
+        'background': 'Folk Hero',
+        'level': 1
+    }
+    
+    unknown_char = character_from_dict(unknown_data)
+    print(f"Created: {unknown_char}")
+    print(f"Type: {type(unknown_char).__name__}")
+    
+    # Import Character for final test
+    Character = get_character_class('Character')
+    print(f"Is base Character: {type(unknown_char) == Character}")
+    
+    print("\n" + "=" * 60)
+    print("✓ All tests completed")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,6 @@
 Barbarian Class - D&D 5e SRD Implementation
 Derived from the base Character class with full Barbarian features
 """
-import os
-import pathlib
-import sys
-
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
@@ -17,6 +11,35 @@ from typing import Dict, List, Optional
 from Class.Character import Character
 
 
+# Level-indexed progression tables (index = level, 1-20; index 0 unused)
+_RAGES_BY_LEVEL = (0, 2, 2, 3, 3, 3, 4, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5, 6, 6, 6, 999)  # 999 = unlimited
+_RAGE_DAMAGE_BY_LEVEL = (0, 2, 2, 2, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 3, 3, 4, 4, 4, 4, 4)
+_BRUTAL_CRIT_BY_LEVEL = (0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3)
+
+# Damage types resisted while raging; a tuple so every rage shares it safely
+_RAGE_RESISTANCES = ("bludgeoning", "piercing", "slashing")
+
+# Feature flags, with the level each one unlocks at
+_F_RECKLESS = 1 << 0      # Reckless Attack + Danger Sense (2)
+_F_FERAL = 1 << 1         # Feral Instinct (7)
+_F_RELENTLESS = 1 << 2    # Relentless Rage (11)
+_F_PERSISTENT = 1 << 3    # Persistent Rage (15)
+_F_INDOMITABLE = 1 << 4   # Indomitable Might (18)
+_F_PATH_3 = 1 << 5
+_F_PATH_6 = 1 << 6
+_F_PATH_10 = 1 << 7
+_F_PATH_14 = 1 << 8
+
+_FEATURE_UNLOCK_LEVELS = (
+    (_F_RECKLESS, 2), (_F_FERAL, 7), (_F_RELENTLESS, 11), (_F_PERSISTENT, 15),
+    (_F_INDOMITABLE, 18), (_F_PATH_3, 3), (_F_PATH_6, 6), (_F_PATH_10, 10), (_F_PATH_14, 14),
+)
+_FEATURE_BITS_BY_LEVEL = tuple(
+    sum(bit for bit, unlock in _FEATURE_UNLOCK_LEVELS if level >= unlock)
+    for level in range(21)
+)
+
+
 @dataclass
 class Barbarian(Character):
     """
@@ -111,73 +134,50 @@ class Barbarian(Character):
     
     def apply_level_features(self):
         """Apply features based on current level according to SRD"""
+        # Progression tables stop at 20
+        lvl = min(self.level, 20)
+        if lvl < 1:
+            return
+        
         # Rage progression
-        if self.level >= 1:
-            self.rages_per_day = 2
-            self.rage_damage = 2
-        if self.level >= 3:
-            self.rages_per_day = 3
-        if self.level >= 6:
-            self.rages_per_day = 4
-        if self.level >= 12:
-            self.rages_per_day = 5
-        if self.level >= 17:
-            self.rages_per_day = 6
-        if self.level >= 20:
-            self.rages_per_day = 999  # Unlimited
+        self.rages_per_day = _RAGES_BY_LEVEL[lvl]
+        self.rage_damage = _RAGE_DAMAGE_BY_LEVEL[lvl]
         
-        # Rage damage progression
-        if self.level >= 9:
-            self.rage_damage = 3
-        if self.level >= 16:
-            self.rage_damage = 4
+        # Numeric features only ever grow, so keep current values below their unlock level
+        if lvl >= 5:
+            self.fast_movement = 10
+        if lvl >= 9:
+            self.brutal_critical_dice = _BRUTAL_CRIT_BY_LEVEL[lvl]
         
-        # Class features by level
-        if self.level >= 2:
+        # Class and path features unlocked by this level
+        bits = _FEATURE_BITS_BY_LEVEL[lvl]
+        if bits & _F_RECKLESS:
             self.reckless_attack_available = True
             self.danger_sense_active = True
-        
-        if self.level >= 5:
-            self.fast_movement = 10
-        
-        if self.level >= 7:
+        if bits & _F_FERAL:
             self.feral_instinct = True
-        
-        if self.level >= 9:
-            self.brutal_critical_dice = 1
-        
-        if self.level >= 11:
+        if bits & _F_RELENTLESS:
             self.relentless_rage_active = True
-        
-        if self.level >= 13:
-            self.brutal_critical_dice = 2
-        
-        if self.level >= 15:
+        if bits & _F_PERSISTENT:
             self.persistent_rage = True
-        
-        if self.level >= 17:
-            self.brutal_critical_dice = 3
-        
-        if self.level >= 18:
+        if bits & _F_INDOMITABLE:
             self.indomitable_might = True
+        if bits & _F_PATH_3:
+            self.path_feature_3 = True
+        if bits & _F_PATH_6:
+            self.path_feature_6 = True
+        if bits & _F_PATH_10:
+            self.path_feature_10 = True
+        if bits & _F_PATH_14:
+            self.path_feature_14 = True
         
-        if self.level >= 20:
+        if lvl >= 20:
             self.primal_champion = True
             # Primal Champion: STR and CON increase by 4, max becomes 24
             self.stats["strength"] = min(self.stats["strength"] + 4, 24)
             self.stats["constitution"] = min(self.stats["constitution"] + 4, 24)
             self.calculate_unarmored_defense()  # Recalculate AC
         
-        # Path features
-        if self.level >= 3:
-            self.path_feature_3 = True
-        if self.level >= 6:
-            self.path_feature_6 = True
-        if self.level >= 10:
-            self.path_feature_10 = True
-        if self.level >= 14:
-            self.path_feature_14 = True
-        
         # Path of the Berserker specific
         if self.primal_path == "Path of the Berserker":
             if self.level >= 6:
@@ -239,11 +239,13 @@ class Barbarian(Character):
     
     def gain_exhaustion(self, levels: int = 1):
         """Gain exhaustion levels (max 6, level 6 = death)"""
-        self.exhaustion_level = min(self.exhaustion_level + levels, 6)
+        level = self.exhaustion_level + levels
+        self.exhaustion_level = level if level < 6 else 6
     
     def remove_exhaustion(self, levels: int = 1):
         """Remove exhaustion levels"""
-        self.exhaustion_level = max(self.exhaustion_level - levels, 0)
+        level = self.exhaustion_level - levels
+        self.exhaustion_level = level if level > 0 else 0
     
     def relentless_rage_save(self) -> bool:
         """
@@ -274,16 +276,8 @@ class Barbarian(Character):
     
     def get_proficiency_bonus(self) -> int:
         """Calculate proficiency bonus based on level"""
-        if self.level < 5:
-            return 2
-        elif self.level < 9:
-            return 3
-        elif self.level < 13:
-            return 4
-        elif self.level < 17:
-            return 5
-        else:
-            return 6
+        # +1 every four levels from 2 at level 1, capped at 6
+        return min(6, 2 + max(0, (self.level - 1) // 4))
     
     def intimidating_presence_dc(self) -> int:
         """
@@ -302,7 +296,7 @@ class Barbarian(Character):
             "advantage_on_str_checks": True,
             "advantage_on_str_saves": True,
             "bonus_melee_damage": self.rage_damage,
-            "resistance_physical": ["bludgeoning", "piercing", "slashing"],
+            "resistance_physical": _RAGE_RESISTANCES,
             "frenzy_active": self.frenzy_active,
             "cannot_cast_spells": True,
             "cannot_concentrate": True
@@ -326,6 +320,7 @@ class Barbarian(Character):
     
     def get_character_sheet(self) -> Dict:
         """Generate a complete character sheet"""
+        prof_bonus = self.get_proficiency_bonus()
         return {
             "name": self.name,
             "race": self.race,
@@ -339,11 +334,11 @@ class Barbarian(Character):
             "speed": 30 + self.fast_movement,
             
             "ability_scores": self.stats,
-            "proficiency_bonus": self.get_proficiency_bonus(),
+            "proficiency_bonus": prof_bonus,
             
             "saving_throws": {
-                "strength": self._get_modifier("strength") + self.get_proficiency_bonus(),
-                "constitution": self._get_modifier("constitution") + self.get_proficiency_bonus()
+                "strength": self._get_modifier("strength") + prof_bonus,
+                "constitution": self._get_modifier("constitution") + prof_bonus
             },
             
             "skills": self.skill_proficiencies,
@@ -383,117 +378,3 @@ class Barbarian(Character):
         path_str = f" ({self.primal_path})" if self.primal_path else ""
         rage_str = f"Rages: {self.rages_used}/{self.rages_per_day}"
         return f"{self.name} - Level {self.level} {self.race} {self.char_class}{path_str} | HP: {self.hp}/{self.max_hp} | AC: {self.ac} | {rage_str}"
-
-
-# Example usage and testing
-if __name__ == "__main__":
-    # Create a new Barbarian
-    barbarian = Barbarian(
-        name="Grog Strongjaw",
-        race="Goliath",
-        char_class="Barbarian",
-        background="Outlander",
-        level=1,
-        stats={
-            "strength": 17,
-            "dexterity": 14,
-            "constitution": 16,
-            "intelligence": 8,
-            "wisdom": 10,
-            "charisma": 12
-        },
-        alignment="Chaotic Neutral",
-        personality_traits=["I'm driven by wanderlust", "I place no stock in wealthy or well-mannered folk"],
-        ideal="Freedom. Chains are meant to be broken",
-        bond="My clan is the most important thing in my life",
-        flaw="I am too enamored of ale, wine, and other intoxicants"
-    )
-    
-    print("=" * 60)
-    print("BARBARIAN CHARACTER SHEET")
-    print("=" * 60)
-    print(barbarian)
-    print()
-    
-    # Display character sheet
-    sheet = barbarian.get_character_sheet()
-    print(f"Name: {sheet['name']}")
-    print(f"Class: {sheet['class']}")
-    print(f"Race: {sheet['race']}")
-    print(f"Background: {sheet['background']}")
-    print(f"Alignment: {sheet['alignment']}")
-    print()
-    
-    print(f"HP: {sheet['hit_points']} | AC: {sheet['armor_class']} | Speed: {sheet['speed']} ft")
-    print()
-    
-    print("Ability Scores:")
-    for ability, score in sheet['ability_scores'].items():
-        modifier = (score - 10) // 2
-        sign = '+' if modifier >= 0 else ''
-        print(f"  {ability.capitalize()}: {score} ({sign}{modifier})")
-    print()
-    
-    print(f"Proficiency Bonus: +{sheet['proficiency_bonus']}")
-    print()
-    
-    print("Rage:")
-    print(f"  Uses: {sheet['rage']['uses']}")
-    print(f"  Damage Bonus: +{sheet['rage']['damage_bonus']}")
-    print(f"  Currently Active: {sheet['rage']['currently_active']}")
-    print()
-    
-    print("Class Features:")
-    for feature, value in sheet['features'].items():
-        if value and value is not False:
-            print(f"  • {feature}: {value if isinstance(value, str) else '✓'}")
-    print()
-    
-    print()
-    
-    # Test rage mechanics
-    print("=" * 60)
-    print("TESTING RAGE MECHANICS")
-    print("=" * 60)
-    
-    print("\nEntering rage...")
-    if barbarian.enter_rage():
-        print("✓ Rage activated!")
-        benefits = barbarian.get_rage_benefits()
-        print(f"  - Advantage on Strength checks: {benefits['advantage_on_str_checks']}")
-        print(f"  - Bonus damage: +{benefits['bonus_melee_damage']}")
-        print(f"  - Resistances: {', '.join(benefits['resistance_physical'])}")
-    
-    print("\nEnding rage...")
-    barbarian.end_rage()
-    print("✓ Rage ended")
-    
-    print(f"\nRages remaining: {barbarian.rages_per_day - barbarian.rages_used}/{barbarian.rages_per_day}")
-    
-    # Test leveling up
-    print("\n" + "=" * 60)
-    print("TESTING LEVEL UP")
-    print("=" * 60)
-    
-    print(f"\nCurrent level: {barbarian.level}")
-    print(f"Current HP: {barbarian.hp}/{barbarian.max_hp}")
-    print(f"Current rages per day: {barbarian.rages_per_day}")
-    
-    barbarian.level_up()
-    print(f"\nAfter level up:")
-    print(f"New level: {barbarian.level}")
-    print(f"New HP: {barbarian.hp}/{barbarian.max_hp}")
-    print(f"Features unlocked: Reckless Attack, Danger Sense")
-    
-    # Level up to 3 to choose path
-    barbarian.level_up()
-    barbarian.primal_path = "Path of the Berserker"
-    barbarian.apply_level_features()
-    
-    print(f"\nLevel {barbarian.level} - Primal Path chosen: {barbarian.primal_path}")
-    print(f"Rages per day: {barbarian.rages_per_day}")
-    print(f"New feature: Frenzy")
-    
-    print("\n" + "=" * 60)
-    print(barbarian)
-    print("=" * 60)
\ No newline at end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Barbarian example usage and feature walkthrough
+
+Run from BackEnd/ with: python -m component.Class.barbarian_demo
+"""
+
+from .barbarian import Barbarian
+
+
+def main():
+    # Create a new Barbarian
+    barbarian = Barbarian(
+        name="Grog Strongjaw",
+        race="Goliath",
+        char_class="Barbarian",
+        background="Outlander",
+        level=1,
+        stats={
+            "strength": 17,
+            "dexterity": 14,
+            "constitution": 16,
+            "intelligence": 8,
+            "wisdom": 10,
+            "charisma": 12
+        },
+        alignment="Chaotic Neutral",
+        personality_traits=["I'm driven by wanderlust", "I place no stock in wealthy or well-mannered folk"],
+        ideal="Freedom. Chains are meant to be broken",
+        bond="My clan is the most important thing in my life",
+        flaw="I am too enamored of ale, wine, and other intoxicants"
+    )
+    
+    print("=" * 60)
+    print("BARBARIAN CHARACTER SHEET")
+    print("=" * 60)
+    print(barbarian)
+    print()
+    
+    # Display character sheet
+    sheet = barbarian.get_character_sheet()
+    print(f"Name: {sheet['name']}")
+    print(f"Class: {sheet['class']}")
+    print(f"Race: {sheet['race']}")
+    print(f"Background: {sheet['background']}")
+    print(f"Alignment: {sheet['alignment']}")
+    print()
+    
+    print(f"HP: {sheet['hit_points']} | AC: {sheet['armor_class']} | Speed: {sheet['speed']} ft")
+    print()
+    
+    print("Ability Scores:")
+    for ability, score in sheet['ability_scores'].items():
+        modifier = (score - 10) // 2
+        sign = '+' if modifier >= 0 else ''
+        print(f"  {ability.capitalize()}: {score} ({sign}{modifier})")
+    print()
+    
+    print(f"Proficiency Bonus: +{sheet['proficiency_bonus']}")
+    print()
+    
+    print("Rage:")
+    print(f"  Uses: {sheet['rage']['uses']}")
+    print(f"  Damage Bonus: +{sheet['rage']['damage_bonus']}")
+    print(f"  Currently Active: {sheet['rage']['currently_active']}")
+    print()
+    
+    print("Class Features:")
+    for feature, value in sheet['features'].items():
+        if value and value is not False:
+            print(f"  • {feature}: {value if isinstance(value, str) else '✓'}")
+    print()
+    
+    print()
+    
+    # Test rage mechanics
+    print("=" * 60)
+    print("TESTING RAGE MECHANICS")
+    print("=" * 60)
+    
+    print("\nEntering rage...")
+    if barbarian.enter_rage():
+        print("✓ Rage activated!")
+        benefits = barbarian.get_rage_benefits()
+        print(f"  - Advantage on Strength checks: {benefits['advantage_on_str_checks']}")
+        print(f"  - Bonus damage: +{benefits['bonus_melee_damage']}")
+        print(f"  - Resistances: {', '.join(benefits['resistance_physical'])}")
+    
+    print("\nEnding rage...")
+    barbarian.end_rage()
+    print("✓ Rage ended")
+    
+    print(f"\nRages remaining: {barbarian.rages_per_day - barbarian.rages_used}/{barbarian.rages_per_day}")
+    
+    # Test leveling up
+    print("\n" + "=" * 60)
+    print("TESTING LEVEL UP")
+    print("=" * 60)
+    
+    print(f"\nCurrent level: {barbarian.level}")
+    print(f"Current HP: {barbarian.hp}/{barbarian.max_hp}")
+    print(f"Current rages per day: {barbarian.rages_per_day}")
+    
+    barbarian.level_up()
+    print(f"\nAfter level up:")
+    print(f"New level: {barbarian.level}")
+    print(f"New HP: {barbarian.hp}/{barbarian.max_hp}")
+    print(f"Features unlocked: Reckless Attack, Danger Sense")
+    
+    # Level up to 3 to choose path
+    barbarian.level_up()
+    barbarian.primal_path = "Path of the Berserker"
+    barbarian.apply_level_features()
+    
+    print(f"\nLevel {barbarian.level} - Primal Path chosen: {barbarian.primal_path}")
+    print(f"Rages per day: {barbarian.rages_per_day}")
+    print(f"New feature: Frenzy")
+    
+    print("\n" + "=" * 60)
+    print(barbarian)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,18 +15,24 @@ project_root = Path(__file__).resolve().parents[1]  # Goes up 1 levels to DNDDM
 sys.path.insert(0, str(project_root))
 
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime
 import random
 import uuid
+from collections import deque
 
 from Class.monsters.monster import Monster
 from Class.Character import Character
 from Class.barbarian import Barbarian
+from Class import get_character_class
 
 from GameState.dice_state import DiceRollState, DiceType, PlayerStats, RollType
 
+# Only the most recent log lines are ever shown, so the log is bounded
+COMBAT_LOG_MAXLEN = 20
+
+
 class CombatPhase(Enum):
     """Combat phases"""
     SETUP = "setup"
@@ -41,7 +47,40 @@ class ParticipantType(Enum):
     MONSTER = "monster"
 
 
-@dataclass
+def _entity_to_dict(entity: Union[Character, Monster]) -> Dict:
+    """Convert a character or monster to a dict tagged with its class name"""
+    data = {f.name: getattr(entity, f.name) for f in fields(entity)}
+    # Combat code attaches class resources (spell_slots_used, ...) to plain
+    # Characters as instance attributes; keep them alongside the fields
+    for name, value in getattr(entity, '__dict__', {}).items():
+        if name not in data:
+            data[name] = value
+    data['_class_type'] = type(entity).__name__
+    return data
+
+
+def _entity_from_dict(data: Dict) -> Union[Character, Monster]:
+    """Rebuild a character or monster from _entity_to_dict output
+    
+    The constructor is bypassed on purpose: class __post_init__ hooks reset
+    HP/AC and re-apply level features, which would clobber combat damage.
+    """
+    data = dict(data)
+    class_type = data.pop('_class_type', 'Character')
+    
+    # Same Class.* modules as the imports above, so isinstance checks hold
+    if class_type == 'Monster':
+        entity_class = Monster
+    else:
+        entity_class = get_character_class(class_type)
+    
+    entity = entity_class.__new__(entity_class)
+    for name, value in data.items():
+        setattr(entity, name, value)
+    return entity
+
+
+@dataclass(slots=True)
 class CombatParticipant:
     """Wrapper for combat participants with combat-specific data"""
     participant_id: str
@@ -81,6 +120,41 @@ class CombatParticipant:
         """Check if participant is alive"""
         return self.get_current_hp() > 0
 
+    def to_dict(self) -> Dict:
+        """Convert participant to a dictionary of primitives"""
+        return {
+            'participant_id': self.participant_id,
+            'name': self.name,
+            'participant_type': self.participant_type.value,
+            'entity': _entity_to_dict(self.entity),
+            'initiative_roll': self.initiative_roll,
+            'initiative_bonus': self.initiative_bonus,
+            'initiative_total': self.initiative_total,
+            'is_active': self.is_active,
+            'is_surprised': self.is_surprised,
+            'has_acted_this_round': self.has_acted_this_round,
+            'temp_hp': self.temp_hp,
+            'conditions': self.conditions
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CombatParticipant':
+        """Create participant from dictionary"""
+        return cls(
+            participant_id=sys.intern(data['participant_id']),
+            name=data['name'],
+            participant_type=ParticipantType(data['participant_type']),
+            entity=_entity_from_dict(data['entity']),
+            initiative_roll=data.get('initiative_roll', 0),
+            initiative_bonus=data.get('initiative_bonus', 0),
+            initiative_total=data.get('initiative_total', 0),
+            is_active=data.get('is_active', True),
+            is_surprised=data.get('is_surprised', False),
+            has_acted_this_round=data.get('has_acted_this_round', False),
+            temp_hp=data.get('temp_hp', 0),
+            conditions=data.get('conditions', [])
+        )
+
     @classmethod
     def from_monster(cls, monster) -> 'CombatParticipant':
         """Create participant from Monster instance"""
@@ -135,7 +209,7 @@ class CombatState:
     actions_taken_this_turn: Dict[str, List[str]] = field(default_factory=dict)
 
     turn_history: List[Dict] = field(default_factory=list)
-    log: List[str] = field(default_factory=list)
+    log: deque = field(default_factory=lambda: deque(maxlen=COMBAT_LOG_MAXLEN))
 
     dice_state: Optional[DiceRollState] = None
     
@@ -173,12 +247,15 @@ class CombatState:
         
         # Initialize collections
         self.participants = []
+        self._chars = []
+        self._monsters = []
+        self._by_id = {}
         self.defeated_participants = []
         self.initiative_order = []
         self.current_turn_index = 0
         self.actions_taken_this_turn = {}
         self.turn_history = []
-        self.log = []
+        self.log = deque(maxlen=COMBAT_LOG_MAXLEN)
         
         # Set dice state
         self.dice_state = dice_state
@@ -206,6 +283,8 @@ class CombatState:
                 initiative_bonus=self._calculate_initiative_bonus(char)
             )
             self.participants.append(participant)
+            self._chars.append(participant)
+        self._index_participants()
     
     def _add_monsters(self, monsters: List[Monster]):
         """Add monsters as combat participants"""
@@ -232,6 +311,13 @@ class CombatState:
                 initiative_bonus=self._calculate_initiative_bonus(monster)
             )
             self.participants.append(participant)
+            self._monsters.append(participant)
+        self._index_participants()
+    
+    def _index_participants(self):
+        """Rebuild the id -> participant index; call after changing participants"""
+        # Reversed so the first participant wins on a duplicate id, like a linear scan
+        self._by_id = {p.participant_id: p for p in reversed(self.participants)}
     
     def _calculate_initiative_bonus(self, entity: Union[Character, Monster]) -> int:
         """Calculate initiative bonus (DEX modifier)"""
@@ -594,15 +680,73 @@ class CombatState:
         
         return None
     # ========================================================================
+    # SERIALIZATION
+    # ========================================================================
+
+    def to_dict(self) -> Dict:
+        """Convert combat state to a dictionary of primitives for session storage"""
+        return {
+            'combat_id': self.combat_id,
+            'encounter_name': self.encounter_name,
+            'combat_phase': self.combat_phase.value,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'total_rounds': self.total_rounds,
+            'participants': [p.to_dict() for p in self.participants],
+            'defeated_participants': self.defeated_participants,
+            'initiative_order': self.initiative_order,
+            'current_turn_index': self.current_turn_index,
+            'current_round': self.current_round,
+            'actions_taken_this_turn': self.actions_taken_this_turn,
+            'turn_history': self.turn_history,
+            'log': list(self.log),
+            'dice_state': self.dice_state.to_dict() if self.dice_state else None,
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CombatState':
+        """Create combat state from dictionary (skips __init__ participant setup)"""
+        combat = cls.__new__(cls)
+        combat.combat_id = data['combat_id']
+        combat.encounter_name = data['encounter_name']
+        combat.combat_phase = CombatPhase(data['combat_phase'])
+        combat.start_time = data.get('start_time')
+        combat.end_time = data.get('end_time')
+        combat.total_rounds = data.get('total_rounds', 0)
+        combat.participants = [CombatParticipant.from_dict(p) for p in data.get('participants', [])]
+        combat._chars = [p for p in combat.participants if p.participant_type is ParticipantType.CHARACTER]
+        combat._monsters = [p for p in combat.participants if p.participant_type is ParticipantType.MONSTER]
+        combat._index_participants()
+        combat.defeated_participants = data.get('defeated_participants', [])
+        combat.initiative_order = [(sys.intern(pid), total) for pid, total in data.get('initiative_order', [])]
+        combat.current_turn_index = data.get('current_turn_index', 0)
+        combat.current_round = data.get('current_round', 0)
+        combat.actions_taken_this_turn = data.get('actions_taken_this_turn', {})
+        combat.turn_history = data.get('turn_history', [])
+        combat.log = deque(data.get('log', []), maxlen=COMBAT_LOG_MAXLEN)
+        dice_data = data.get('dice_state')
+        combat.dice_state = DiceRollState.from_dict(dice_data) if dice_data else None
+        combat.metadata = data.get('metadata', {})
+        return combat
+
+    # ========================================================================
     # HELPER METHODS
     # ========================================================================
     
     def get_participant_by_id(self, participant_id: str) -> Optional[CombatParticipant]:
         """Get participant by ID"""
-        for participant in self.participants:
-            if participant.participant_id == participant_id:
-                return participant
-        return None
+        return self._by_id.get(participant_id)
+    
+    @property
+    def character_participants(self) -> Tuple[CombatParticipant, ...]:
+        """Character participants, in the order they were added (read-only)"""
+        return tuple(self._chars)
+    
+    @property
+    def monster_participants(self) -> Tuple[CombatParticipant, ...]:
+        """Monster participants, in the order they were added (read-only)"""
+        return tuple(self._monsters)
     
     def get_current_participant(self) -> Optional[CombatParticipant]:
         """Get the participant whose turn it currently is"""
@@ -638,6 +782,24 @@ class CombatState:
             'timestamp': datetime.now().isoformat()
         })
         
+    def get_turn_delta(self) -> Dict:
+        """Get the small part of the summary that changes when the turn advances"""
+        current = self.get_current_participant()
+        return {
+            'turn_index': self.current_turn_index,
+            'round': self.current_round,
+            'active_id': current.participant_id if current else None,
+            'new_statuses': [
+                {
+                    'id': p.participant_id,
+                    'hp': p.get_current_hp(),
+                    'is_alive': p.is_alive(),
+                    'conditions': p.conditions
+                }
+                for p in self.participants
+            ]
+        }
+
     def get_combat_summary(self) -> Dict:
         """Get current combat state summary for UI/LLM"""
         summary = {
@@ -653,7 +815,7 @@ class CombatState:
             'current_turn': None,
             'defeated_count': len(self.defeated_participants),
             
-            'combat_log': self.log[-20:] if len(self.log) > 20 else self.log
+            'combat_log': list(self.log)
         }
         
         # Add participant data with full character information
@@ -5,6 +5,7 @@ Modular structure with separate phase files
 """
 
 from flask import Flask, render_template, request, jsonify, redirect, url_for  
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO 
 from dataclasses import asdict  
 import secrets
@@ -22,6 +23,13 @@ from combat_api_routes import register_combat_routes
 
 #from combat_test_route import register_combat_test_routes
 
+# orjson is a much faster drop-in for the stdlib json used by jsonify/get_json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # Import AI DM components with better error handling
 OllamaDM = None
@@ -81,6 +89,48 @@ app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
 app.config['SECRET_KEY'] = secrets.token_hex(16)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, matching Flask's default output
+    (int dict keys such as spell slot levels become strings, datetimes go
+    through Flask's default handler as HTTP dates)"""
+
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if ORJSON_AVAILABLE else 0
+
+    def _orjson_option(self, indent: bool = False) -> int:
+        """orjson flags matching the provider's sort_keys and the given indent"""
+        option = self.option
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # Formatting options (indent, sort_keys, ...) are only supported by stdlib json
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Same layout rules as the default provider: indented in debug mode
+        # unless compact is set, sorted keys, trailing newline
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._orjson_option(indent)) + b"\n",
+            mimetype=self.mimetype
+        )
+
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Initialize systems
 prompt_templates = PromptTemplates()
 campaign_mgr = get_campaign_manager()
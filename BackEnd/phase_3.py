@@ -1093,8 +1093,7 @@ def register_story_package_routes(app):
             import uuid
             old_combat_id = session.get('current_combat_id')
             if old_combat_id:
-                old_session_key = f'combat_{old_combat_id}'
-                session.pop(old_session_key, None)
+                delete_combat_from_session(old_combat_id)
                 print(f"[Combat] Cleared old combat data: {old_combat_id}")
             
             # Generate fresh combat ID
@@ -1156,17 +1155,9 @@ def register_story_package_routes(app):
                 combat_state.determine_turn_order()
                 combat_state.init_combat()
                 
-                # Save using the proper serialization function
-                try:
-                    combat_str = serialize_combat(combat_state)
-                    session_key = f'combat_{combat_id}'
-                    session[session_key] = combat_str
-                    session.modified = True
-                    print(f"[Combat] Combat initialized and saved with ID: {combat_id}")
-                except Exception as e:
-                    print(f"[Combat] Error saving combat: {e}")
-                    import traceback
-                    traceback.print_exc()
+                # Saved immediately; a failure falls through to this page's own error response
+                write_combat_now(combat_id, combat_state)
+                print(f"[Combat] Combat initialized and saved with ID: {combat_id}")
             
             # Get summary for template
             combat_data = combat_state.get_combat_summary()
@@ -1321,49 +1312,9 @@ def register_story_package_routes(app):
     
     print("✓ Story package routes registered")
 
-    # Serilization
-    import pickle
-    import base64
+    # Combat storage (shared with the combat API so both read the same store)
+    from combat_api_routes import write_combat_now, delete_combat_from_session
 
-    def serialize_combat(combat: CombatState) -> str:
-        """Serialize combat state to string for session storage"""
-        try:
-            # Use pickle to serialize
-            pickled = pickle.dumps(combat)
-            # Encode to base64 string
-            return base64.b64encode(pickled).decode('utf-8')
-        except Exception as e:
-            print(f"Error serializing combat: {e}")
-            raise
-
-    def deserialize_combat(combat_str: str) -> CombatState:
-        """Deserialize combat state from session string"""
-        try:
-            # Decode from base64
-            pickled = base64.b64decode(combat_str.encode('utf-8'))
-            # Unpickle
-            return pickle.loads(pickled)
-        except Exception as e:
-            print(f"Error deserializing combat: {e}")
-            raise
-
-    # Update the helper functions:
-
-
-    def save_combat_to_session(combat_id: str, combat: CombatState):
-        """Save combat to session with proper serialization"""
-        session_key = f'combat_{combat_id}'
-        
-        try:
-            combat_str = serialize_combat(combat)
-            session[session_key] = combat_str
-            session.modified = True
-        except Exception as e:
-            print(f"Error saving combat to session: {e}")
-            raise
-
-   
-    
     
     @app.route('/api/campaign/<campaign_name>/characters', methods=['GET'])
     def get_campaign_characters(campaign_name):
@@ -1375,7 +1326,7 @@ def register_story_package_routes(app):
             # Convert to dicts
             char_dicts = []
             for char in characters:
-                if hasattr(char, '__dict__'):
+                if not isinstance(char, dict):
                     char_dict = {
                         'name': char.name,
                         'char_class': getattr(char, 'char_class', 'Unknown'),
@@ -1409,19 +1360,5 @@ def register_story_package_routes(app):
 
     
         
-    def get_combat_from_session(combat_id: str) -> Optional[CombatState]:
-        """Load combat from session with proper deserialization"""
-        session_key = f'combat_{combat_id}'
-        
-        if session_key not in session:
-            return None
-        
-        try:
-            combat_str = session[session_key]
-            return deserialize_combat(combat_str)
-        except Exception as e:
-            print(f"Error loading combat from session: {e}")
-            return None
-        
     print("✓ Story package routes registered")
     
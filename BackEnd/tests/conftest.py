@@ -0,0 +1,90 @@
+"""
+Shared fixtures for the BackEnd combat tests
+
+Run from BackEnd/ with: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# The backend modules import each other as top-level modules (combat_api_routes,
+# component.*), so BackEnd/ itself must be importable
+BACKEND_DIR = str(Path(__file__).resolve().parents[1])
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from component.Class import create_character
+from component.Class.Character import Character
+from component.Class.monsters.monster import Monster
+from component.GameState.combat_state import CombatState, CombatPhase
+
+
+def make_combat() -> CombatState:
+    """A small combat whose first turn belongs to the Cleric"""
+    characters = [
+        Character(name='Pike', race='Gnome', char_class='Cleric', background='Acolyte', level=3),
+        create_character('Barbarian', name='Grog', race='Goliath', background='Outlander', level=3),
+    ]
+    monsters = [
+        Monster(name='Goblin', monster_type='Humanoid', size='Small', alignment='NE',
+                challenge_rating=0.25, hp=7, ac=15, stats={'strength': 8, 'dexterity': 14})
+    ]
+    combat = CombatState(encounter_name='Test', characters=characters, monsters=monsters,
+                         combat_id='test_combat')
+
+    # Fixed turn order instead of rolled initiative
+    combat.initiative_order = [('char_pike', 20), ('char_grog', 15), ('mon_goblin_1', 5)]
+    combat.current_turn_index = 0
+    combat.current_round = 1
+    combat.combat_phase = CombatPhase.ACTIVE
+    return combat
+
+
+class FakeRedis(dict):
+    """Just enough of redis.Redis for RedisCombatStore"""
+
+    def __init__(self):
+        super().__init__()
+        self.sets = 0
+        self.expires = 0
+
+    def get(self, key):
+        return dict.get(self, key)
+
+    def set(self, key, value, ex=None):
+        self.sets += 1
+        self[key] = value
+
+    def expire(self, key, seconds):
+        self.expires += 1
+
+    def delete(self, key):
+        self.pop(key, None)
+
+
+@pytest.fixture
+def combat():
+    return make_combat()
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    """A fresh in-process combat store installed as the module's store"""
+    import combat_api_routes
+    store = combat_api_routes.MemoryCombatStore()
+    monkeypatch.setattr(combat_api_routes, 'combat_store', store)
+    monkeypatch.setattr(combat_api_routes, '_summary_cache', type(combat_api_routes._summary_cache)())
+    return store
+
+
+@pytest.fixture
+def redis_store(monkeypatch):
+    """A RedisCombatStore backed by FakeRedis, installed as the module's store"""
+    import combat_api_routes
+    store = combat_api_routes.RedisCombatStore.__new__(combat_api_routes.RedisCombatStore)
+    store.client = FakeRedis()
+    monkeypatch.setattr(combat_api_routes, 'combat_store', store)
+    monkeypatch.setattr(combat_api_routes, '_combat_cache', type(combat_api_routes._combat_cache)())
+    return store
@@ -0,0 +1,202 @@
+"""
+Combat stores and the combat API's end-of-request write-back
+"""
+
+import pytest
+from flask import Flask
+
+import combat_api_routes
+from combat_api_routes import (
+    get_combat_from_session, save_combat_to_session, serialize_combat
+)
+
+
+@pytest.fixture
+def client(memory_store):
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'test'
+    combat_api_routes.register_combat_routes(app)
+    return app.test_client()
+
+
+def goblin_hp(combat_id='test_combat'):
+    combat = get_combat_from_session(combat_id)
+    return combat.get_participant_by_id('mon_goblin_1').entity.hp
+
+
+def hit_goblin(hp):
+    """Stand-in for resolve_action that sets the goblin's HP"""
+    def resolve(combat, character, action_type, action_name, target, action_data):
+        combat.get_participant_by_id('mon_goblin_1').entity.hp = hp
+        return {'success': True, 'message': 'Hit'}
+    return resolve
+
+
+# ============================================================================
+# STORES
+# ============================================================================
+
+def test_memory_store_round_trip(memory_store, combat):
+    memory_store.save('c1', combat)
+
+    loaded = memory_store.load('c1')
+
+    assert loaded.get_participant_by_id('char_grog').entity.hp == combat.get_participant_by_id('char_grog').entity.hp
+    assert memory_store.load('missing') is None
+
+
+def test_memory_store_gives_each_load_its_own_copy(memory_store, combat):
+    memory_store.save('c1', combat)
+
+    first = memory_store.load('c1')
+    first.get_participant_by_id('mon_goblin_1').entity.hp = 1
+
+    assert first is not combat
+    assert memory_store.load('c1').get_participant_by_id('mon_goblin_1').entity.hp == 7
+
+
+def test_memory_store_delete(memory_store, combat):
+    memory_store.save('c1', combat)
+    memory_store.delete('c1')
+
+    assert memory_store.load('c1') is None
+
+
+def test_redis_store_round_trip(redis_store, combat):
+    redis_store.save('c1', combat)
+
+    assert redis_store.client['combat:c1'] == serialize_combat(combat)
+    first = redis_store.load('c1')
+    second = redis_store.load('c1')
+    assert first is not second
+    assert first.get_participant_by_id('char_pike').entity.char_class == 'Cleric'
+
+
+def test_redis_store_unchanged_save_only_refreshes_ttl(redis_store, combat):
+    redis_store.save('c1', combat)
+    loaded = redis_store.load('c1')
+
+    redis_store.save('c1', loaded)
+
+    assert redis_store.client.sets == 1
+    assert redis_store.client.expires == 1
+
+    loaded.get_participant_by_id('mon_goblin_1').entity.hp = 2
+    redis_store.save('c1', loaded)
+
+    assert redis_store.client.sets == 2
+    assert redis_store.load('c1').get_participant_by_id('mon_goblin_1').entity.hp == 2
+
+
+def test_redis_store_delete(redis_store, combat):
+    redis_store.save('c1', combat)
+    redis_store.delete('c1')
+
+    assert redis_store.load('c1') is None
+    assert combat_api_routes.cached_combat_bytes('c1') is None
+
+
+# ============================================================================
+# ROUTES
+# ============================================================================
+
+def test_player_action_is_saved(client, combat, monkeypatch):
+    save_combat_to_session('test_combat', combat)
+    monkeypatch.setattr(combat_api_routes, 'resolve_action', hit_goblin(2))
+
+    response = client.post('/api/combat/test_combat/player-action', json={
+        'character_id': 'char_pike', 'action_type': 'attack', 'target_id': 'mon_goblin_1'
+    })
+
+    assert response.status_code == 200
+    assert goblin_hp() == 2
+
+
+def test_failed_action_is_not_saved(client, combat, monkeypatch):
+    save_combat_to_session('test_combat', combat)
+
+    def fail(combat, *args):
+        combat.get_participant_by_id('mon_goblin_1').entity.hp = 0
+        raise RuntimeError('boom')
+    monkeypatch.setattr(combat_api_routes, 'resolve_action', fail)
+
+    response = client.post('/api/combat/test_combat/player-action', json={
+        'character_id': 'char_pike', 'action_type': 'attack', 'target_id': 'mon_goblin_1'
+    })
+
+    assert response.status_code == 500
+    assert goblin_hp() == 7
+
+
+def test_failed_save_returns_error(client, combat, memory_store, monkeypatch):
+    save_combat_to_session('test_combat', combat)
+    monkeypatch.setattr(combat_api_routes, 'resolve_action', hit_goblin(2))
+
+    def broken_save(combat_id, combat):
+        raise IOError('store unavailable')
+    monkeypatch.setattr(memory_store, 'save', broken_save)
+
+    response = client.post('/api/combat/test_combat/player-action', json={
+        'character_id': 'char_pike', 'action_type': 'attack', 'target_id': 'mon_goblin_1'
+    })
+
+    assert response.status_code == 500
+    assert response.get_json()['success'] is False
+    assert 'store unavailable' in response.get_json()['error']
+    assert goblin_hp() == 7
+
+
+def test_advance_turn_returns_delta_and_saves(client, combat):
+    save_combat_to_session('test_combat', combat)
+
+    response = client.post('/api/combat/test_combat/advance-turn', json={})
+
+    data = response.get_json()
+    assert data['success'] is True
+    assert data['current_turn']['participant_id'] == 'char_grog'
+    assert data['turn_delta']['active_id'] == 'char_grog'
+    assert 'combat_state' not in data
+    assert get_combat_from_session('test_combat').current_turn_index == 1
+
+
+def test_advance_turn_full_summary(client, combat):
+    save_combat_to_session('test_combat', combat)
+
+    response = client.post('/api/combat/test_combat/advance-turn?full=1', json={})
+
+    data = response.get_json()
+    assert 'combat_state' in data
+    assert 'turn_delta' not in data
+
+
+def test_summary_body_reused_until_combat_changes(client, combat, monkeypatch):
+    save_combat_to_session('test_combat', combat)
+
+    first = client.get('/api/combat/test_combat/summary')
+    decodes = []
+    real_deserialize = combat_api_routes.deserialize_combat
+    monkeypatch.setattr(combat_api_routes, 'deserialize_combat',
+                        lambda b: decodes.append(b) or real_deserialize(b))
+
+    second = client.get('/api/combat/test_combat/summary')
+
+    assert second.get_data() == first.get_data()
+    assert decodes == []
+
+    monkeypatch.setattr(combat_api_routes, 'resolve_action', hit_goblin(2))
+    client.post('/api/combat/test_combat/player-action', json={
+        'character_id': 'char_pike', 'action_type': 'attack', 'target_id': 'mon_goblin_1'
+    })
+    decodes.clear()
+
+    third = client.get('/api/combat/test_combat/summary').get_json()
+
+    assert len(decodes) == 1
+    goblin = next(p for p in third['summary']['participants'] if p['id'] == 'mon_goblin_1')
+    assert goblin['hp'] == 2
+
+
+def test_unknown_combat(client):
+    response = client.post('/api/combat/nope/advance-turn', json={})
+
+    assert response.status_code == 404
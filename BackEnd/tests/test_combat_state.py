@@ -0,0 +1,126 @@
+"""
+CombatState serialization round trips and participant lookups
+"""
+
+from combat_api_routes import serialize_combat, deserialize_combat, initialize_character_resources
+from component.Class.Character import Character
+from component.GameState.combat_state import (
+    Barbarian, CombatParticipant, CombatState, ParticipantType
+)
+
+from conftest import make_combat
+
+
+def round_trip(combat: CombatState) -> CombatState:
+    return deserialize_combat(serialize_combat(combat))
+
+
+def test_round_trip_keeps_hp_and_turn_state(combat):
+    combat.get_participant_by_id('mon_goblin_1').entity.hp = 3
+    combat.get_participant_by_id('char_grog').temp_hp = 4
+    combat._log('Pike attacks')
+
+    loaded = round_trip(combat)
+
+    assert loaded.combat_id == combat.combat_id
+    assert loaded.combat_phase is combat.combat_phase
+    assert loaded.current_round == 1
+    assert loaded.initiative_order == combat.initiative_order
+    assert loaded.get_participant_by_id('mon_goblin_1').entity.hp == 3
+    assert loaded.get_participant_by_id('char_grog').temp_hp == 4
+    assert list(loaded.log) == list(combat.log)
+
+
+def test_round_trip_keeps_class_type(combat):
+    loaded = round_trip(combat)
+
+    grog = loaded.get_participant_by_id('char_grog')
+    pike = loaded.get_participant_by_id('char_pike')
+    assert grog.participant_type is ParticipantType.CHARACTER
+    # Same class objects combat_state imports, so isinstance checks hold
+    assert isinstance(grog.entity, Barbarian)
+    assert type(pike.entity).__name__ == 'Character'
+    assert pike.entity.char_class == 'Cleric'
+
+
+def test_round_trip_keeps_class_resources(combat):
+    grog = combat.get_participant_by_id('char_grog').entity
+    grog.rages_used = 1
+    grog.currently_raging = True
+
+    # Resources attached to a plain Character are not dataclass fields
+    pike = combat.get_participant_by_id('char_pike').entity
+    initialize_character_resources(pike)
+    pike.spell_slots_used[1] = 2
+    pike.channel_divinity_used = 1
+
+    loaded = round_trip(combat)
+
+    grog = loaded.get_participant_by_id('char_grog').entity
+    assert grog.rages_used == 1
+    assert grog.currently_raging is True
+    pike = loaded.get_participant_by_id('char_pike').entity
+    assert pike.spell_slots_used[1] == 2
+    assert pike.channel_divinity_used == 1
+
+
+def test_round_trip_does_not_rerun_post_init(combat):
+    # Barbarian.__post_init__ resets level-1 HP; a damaged Barbarian must stay damaged
+    grog = combat.get_participant_by_id('char_grog').entity
+    grog.hp = 5
+
+    loaded = round_trip(combat)
+
+    assert loaded.get_participant_by_id('char_grog').entity.hp == 5
+
+
+def test_participant_lookup_after_load(combat):
+    loaded = round_trip(combat)
+
+    assert loaded.get_participant_by_id('char_pike').name == 'Pike'
+    assert loaded.get_participant_by_id('missing') is None
+    assert loaded.get_current_participant().participant_id == 'char_pike'
+
+
+def test_participant_lookup_sees_added_participants():
+    combat = make_combat()
+    assert combat.get_participant_by_id('char_scanlan') is None
+
+    combat._add_characters([
+        Character(name='Scanlan', race='Gnome', char_class='Bard', background='Entertainer')
+    ])
+
+    assert combat.get_participant_by_id('char_scanlan').name == 'Scanlan'
+
+
+def test_turn_delta(combat):
+    combat.get_participant_by_id('mon_goblin_1').entity.hp = 0
+
+    delta = combat.get_turn_delta()
+
+    assert delta['turn_index'] == 0
+    assert delta['round'] == 1
+    assert delta['active_id'] == 'char_pike'
+    statuses = {s['id']: s for s in delta['new_statuses']}
+    assert set(statuses) == {'char_pike', 'char_grog', 'mon_goblin_1'}
+    assert statuses['mon_goblin_1']['hp'] == 0
+    assert statuses['mon_goblin_1']['is_alive'] is False
+    assert statuses['char_pike']['is_alive'] is True
+
+
+def test_participant_round_trip_without_combat(combat):
+    participant = combat.get_participant_by_id('char_grog')
+
+    loaded = CombatParticipant.from_dict(participant.to_dict())
+
+    assert loaded.participant_id == 'char_grog'
+    assert loaded.entity.hp == participant.entity.hp
+    assert loaded.initiative_bonus == participant.initiative_bonus
+
+
+def test_participants_by_type(combat):
+    loaded = round_trip(combat)
+
+    assert [p.participant_id for p in loaded.character_participants] == ['char_pike', 'char_grog']
+    assert [p.participant_id for p in loaded.monster_participants] == ['mon_goblin_1']
+    assert isinstance(loaded.character_participants, tuple)